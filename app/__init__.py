@@ -67,6 +67,7 @@ def create_app():
     
     # GPU configuration for Whisper transcription
     app.config['USE_GPU'] = os.environ.get('USE_GPU', 'true')
+    app.config['WHISPER_BATCH_SIZE'] = os.environ.get('WHISPER_BATCH_SIZE', '16')
     
     # Flask debug mode
     app.config['DEBUG'] = os.environ.get('FLASK_DEBUG', 'True').lower() == 'true'
@@ -9,6 +9,7 @@ Based on the comprehensive standalone script with improvements for:
 """
 import os
 import re
+import sys
 import json
 import time
 import requests
@@ -16,10 +17,18 @@ import subprocess
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
-from datetime import timedelta
 import threading
 import random
 import math
+import functools
+import hashlib
+import bisect
+import importlib.util
+import shutil
+from collections import deque
+from itertools import accumulate, groupby, islice
+from concurrent.futures import ThreadPoolExecutor, wait
+from operator import methodcaller
 
 # Import progress logger for clean output
 from app.progress import get_logger, reset_logger
@@ -27,11 +36,33 @@ from app.progress import get_logger, reset_logger
 # Get verbose setting from environment (default: False for clean output)
 VERBOSE = os.environ.get('VERBOSE', 'false').lower() == 'true'
 
+# Keep intermediate JSON files on disk for debugging (default: False)
+WRITE_INTERMEDIATES = os.environ.get('DEBUG_WRITE_INTERMEDIATES', 'false').lower() == 'true'
+
+# Directory for cached speaker-extraction responses keyed by prompt (default: disabled)
+LLM_CACHE_DIR = os.environ.get('LLM_CACHE_DIR')
+
+# Run speaker extraction as two sequential AI calls (mentions, then profiles)
+# instead of one combined call (default: False, single call)
+SPEAKER_EXTRACTION_TWO_PASS = os.environ.get('SPEAKER_EXTRACTION_TWO_PASS', 'false').lower() == 'true'
+
 # Suppress verbose OpenAI library logging
 logging.getLogger("openai").setLevel(logging.WARNING)
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logging.getLogger("httpcore").setLevel(logging.WARNING)
 
+# Pipeline status output goes through one stream handler instead of bare
+# print() calls. Records are flushed as they are emitted, so progress stays
+# live; the saving comes from levels: silence it with
+# log.setLevel(logging.WARNING) and filtered records cost no I/O at all
+log = logging.getLogger(__name__)
+if not log.handlers:
+    _stream_handler = logging.StreamHandler()
+    _stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(_stream_handler)
+    log.setLevel(logging.DEBUG if VERBOSE else logging.INFO)
+    log.propagate = False
+
 # Optional imports for AI functionality
 try:
     import yt_dlp
@@ -50,6 +81,14 @@ except ImportError:
     TORCH_AVAILABLE = False
     print("Warning: openai-whisper not available. Transcription will be disabled.")
 
+# Optional CTranslate2 Whisper backend (preferred over openai-whisper when installed)
+try:
+    from faster_whisper import WhisperModel, BatchedInferencePipeline, decode_audio
+    import ctranslate2
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
 try:
     import requests
     import google.generativeai as genai
@@ -59,15 +98,45 @@ except ImportError:
     genai = None  # type: ignore
     print("Warning: google-generativeai not available. Speaker separation will be disabled.")
 
-# Initialize Azure OpenAI imports
-AZURE_OPENAI_AVAILABLE = False
-AzureOpenAI = None  # type: ignore
+# Azure OpenAI availability; the openai package itself (httpx, pydantic, ...)
+# is only imported when an AI client or response type is first needed, so
+# workers that never reach speaker extraction don't pay for it at startup
+AZURE_OPENAI_AVAILABLE = importlib.util.find_spec('openai') is not None
+if not AZURE_OPENAI_AVAILABLE:
+    print("Warning: openai not available. Enhanced speaker identification will be disabled.")
 
+# Optional fast JSON serializer (falls back to the stdlib json module)
 try:
-    from openai import AzureOpenAI
-    AZURE_OPENAI_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
-    print("Warning: openai not available. Enhanced speaker identification will be disabled.")
+    ORJSON_AVAILABLE = False
+
+# Optional local tokenizer for batch token budgeting (falls back to a char heuristic)
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# Optional Aho-Corasick automaton for speaker indicator keyword matching
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# External binaries, resolved once at import time
+FFMPEG_PATH = shutil.which('ffmpeg')
+
+# yt-dlp audio extraction: sources that are already MP3 are stream-copied by
+# FFmpegExtractAudio; everything else is encoded as libmp3lame VBR (-q:a 2)
+# with ffmpeg free to use all cores for decoding
+MP3_VBR_QUALITY = '2'
+YTDLP_POSTPROCESSOR_ARGS = {'extractaudio': ['-threads', '0']}
+
+# Write buffer for the per-segment transcript/SRT output
+SEGMENT_WRITE_BUFFER = 1 << 20
 
 # Configuration constants
 PARTNER_ID = "2503451"  # constant for all UN WebTV assets
@@ -75,13 +144,16 @@ PARTNER_ID = "2503451"  # constant for all UN WebTV assets
 # Gemini configuration from upgrade files
 MODEL_NAME = "gemini-2.5-flash-lite-preview-06-17"
 MAX_TOKENS_PER_BATCH = 10000  # Smaller batches to avoid truncated responses
-ESTIMATED_TOKENS_PER_SEGMENT = 100  # Conservative estimate
-MAX_SEGMENTS_PER_BATCH = MAX_TOKENS_PER_BATCH // ESTIMATED_TOKENS_PER_SEGMENT
+# Gemini batches in flight at once; 1 restores sequential processing, where each
+# batch also sees the speakers identified in the batches before it
+MAX_CONCURRENT_BATCHES = 5
 
 # Retry configuration
 MAX_RETRIES = 3
 BASE_DELAY = 1  # Base delay in seconds
 MAX_DELAY = 60  # Maximum delay in seconds
+MAX_PARSE_RETRIES = 2  # Immediate re-asks when a response fails JSON validation
+GEMINI_REQUESTS_PER_MINUTE = 60  # Shared pacing budget for all Gemini calls in the process
 
 # Azure OpenAI Enhanced Speaker Identification Configuration
 # This provides better accuracy for speaker identification in long meetings
@@ -132,6 +204,14 @@ Return your findings as a JSON object with this structure:
 Transcript text:
 '''
 
+# genai.configure is process-global, so only the model for the most recently
+# configured key is kept; batches reuse it instead of re-configuring per call
+@functools.lru_cache(maxsize=1)
+def _get_gemini_model(api_key):
+    """Return a cached GenerativeModel, configuring the SDK once per API key."""
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(model_name=MODEL_NAME)
+
 def setup_gemini_api():
     """Initialize Gemini API with configured key"""
     if not GEMINI_AVAILABLE:
@@ -147,8 +227,7 @@ def setup_gemini_api():
         api_key = os.environ.get('GEMINI_API_KEY')
     
     if api_key:
-        genai.configure(api_key=api_key)
-        return genai.GenerativeModel(MODEL_NAME)
+        return _get_gemini_model(api_key)
     return None
 
 
@@ -234,6 +313,47 @@ def get_azure_openai_config():
     return None
 
 
+# Clients are cached per configuration, so every call (both extraction passes,
+# per-turn context lookups, later meetings) reuses one HTTP connection pool
+# instead of paying a new TLS handshake; a config change yields a new client
+@functools.lru_cache(maxsize=1)
+def _get_shared_http_client():
+    """
+    Return the process-wide httpx client behind the OpenAI/Azure clients. With
+    the optional h2 package it speaks HTTP/2, so consecutive and concurrent
+    requests to an endpoint share one TLS session.
+    """
+    import httpx
+    return httpx.Client(
+        http2=importlib.util.find_spec('h2') is not None,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        timeout=httpx.Timeout(600.0, connect=5.0)  # openai's defaults
+    )
+
+@functools.lru_cache(maxsize=1)
+def _get_azure_openai_client(api_key, api_version, endpoint):
+    """Return a cached AzureOpenAI client for the given configuration."""
+    from openai import AzureOpenAI
+    return AzureOpenAI(
+        api_key=api_key,
+        api_version=api_version,
+        azure_endpoint=endpoint,
+        http_client=_get_shared_http_client()
+    )
+
+@functools.lru_cache(maxsize=1)
+def _get_openai_client(api_key, base_url, organization):
+    """Return a cached OpenAI client for the given configuration."""
+    from openai import OpenAI
+    client_kwargs = {
+        'api_key': api_key,
+        'base_url': base_url,
+        'http_client': _get_shared_http_client()
+    }
+    if organization:
+        client_kwargs['organization'] = organization
+    return OpenAI(**client_kwargs)
+
 def setup_azure_openai_client():
     """Initialize Azure OpenAI client if configured"""
     if not AZURE_OPENAI_AVAILABLE:
@@ -244,11 +364,7 @@ def setup_azure_openai_client():
         return None
     
     try:
-        client = AzureOpenAI(
-            api_key=config['api_key'],
-            api_version=config['api_version'],
-            azure_endpoint=config['endpoint']
-        )
+        client = _get_azure_openai_client(config['api_key'], config['api_version'], config['endpoint'])
         return client, config['deployment']
     except Exception as e:
         print(f"Error initializing Azure OpenAI client: {e}")
@@ -286,61 +402,377 @@ def setup_openai_client():
         return None
     
     try:
-        from openai import OpenAI
-        client_kwargs = {
-            'api_key': config['api_key'],
-            'base_url': config['base_url']
-        }
-        if config.get('org_id'):
-            client_kwargs['organization'] = config['org_id']
-        
-        client = OpenAI(**client_kwargs)
+        client = _get_openai_client(config['api_key'], config['base_url'], config.get('org_id'))
         return client, config['model']
     except Exception as e:
         print(f"Error initializing OpenAI client: {e}")
         return None
 
 
-def extract_speaker_info_with_gpt(transcript_text):
+# Only near-deterministic requests are cached; anything sampled hotter would
+# pin one random completion forever
+LLM_CACHE_MAX_TEMPERATURE = 0.1
+
+def _is_cacheable_request(api_params):
+    """Return True if a chat request is sampled cold enough for its result to be cached."""
+    temperature = api_params.get('temperature')
+    return temperature is not None and temperature <= LLM_CACHE_MAX_TEMPERATURE
+
+def _llm_cache_path(client, api_params):
+    """Return the cache file for a chat request, or None when it should not be cached."""
+    if not LLM_CACHE_DIR or not _is_cacheable_request(api_params):
+        return None
+    
+    # Endpoint + every request parameter (model, messages, limits, sampling)
+    key_source = json.dumps(
+        {'endpoint': str(client.base_url), 'params': api_params},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    )
+    key = hashlib.sha256(key_source.encode('utf-8')).hexdigest()
+    return Path(LLM_CACHE_DIR) / f"{key}.json"
+
+# Structural characters for tracking JSON nesting in streamed text
+_JSON_STRUCTURE_RE = re.compile(r'[{}"\\]')
+
+class JsonObjectEndDetector:
+    """
+    Incrementally track brace depth (outside strings) of streamed text, to tell
+    when the first top-level JSON object has closed. Each piece is scanned once;
+    start/end are the object's offsets in all text fed so far.
     """
-    Multi-pass speaker extraction with priority order:
-    1. Azure OpenAI (GPT-4) - PRIMARY
-    2. OpenAI API (GPT-5/GPT-4 Turbo) - SECONDARY
-    3. Ollama (Gemma 3) - TERTIARY
     
-    Pass 1: Extract all speaker mentions and introductions
-    Pass 2: Build comprehensive speaker profiles with validation
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.closed = False
+        self.start = None  # offset of the opening '{'
+        self.end = None  # offset just past the closing '}'
+        self._offset = 0  # length of the pieces fed before the current one
+        self._in_string = False
+        self._escaped_pos = -1  # offset in the next piece escaped by a trailing backslash
+    
+    def feed(self, text):
+        """Scan the next piece of text; return True once the object has closed."""
+        escaped_pos = self._escaped_pos
+        for match in _JSON_STRUCTURE_RE.finditer(text):
+            pos = match.start()
+            if pos == escaped_pos:
+                continue
+            char = match.group()
+            if self._in_string:
+                if char == '\\':
+                    escaped_pos = pos + 1
+                elif char == '"':
+                    self._in_string = False
+            elif char == '{':
+                if not self.started:
+                    self.started = True
+                    self.start = self._offset + pos
+                self.depth += 1
+            elif not self.started:
+                continue  # prose or a ```json fence before the object
+            elif char == '"':
+                self._in_string = True
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.closed = True
+                    self.end = self._offset + pos + 1
+                    self._offset += len(text)
+                    return True
+        self._escaped_pos = 0 if escaped_pos == len(text) else -1
+        self._offset += len(text)
+        return False
+
+# Content chunks still read after the JSON object closes (a closing ``` fence
+# and the final usage chunk); anything longer is the model rambling on
+MAX_CHUNKS_AFTER_JSON = 32
+
+def _stream_chat_completion(client, api_params):
+    """
+    Stream a chat completion and assemble it into a ChatCompletion. The JSON
+    object in the reply is tracked as it arrives, and reading stops shortly
+    after it closes instead of waiting out any trailing text.
+    """
+    import httpx
+    from openai import APIConnectionError
+    from openai.types.chat import ChatCompletion
+    
+    stream = client.chat.completions.create(
+        **api_params,
+        stream=True,
+        stream_options={'include_usage': True}
+    )
+    
+    # Deltas are collected in a list and joined once at the end
+    chunks = []
+    detector = JsonObjectEndDetector()
+    extra_chunks = 0
+    first_chunk = None
+    finish_reason = None
+    usage = None
+    try:
+        for chunk in stream:
+            if first_chunk is None:
+                first_chunk = chunk
+            if chunk.usage is not None:
+                usage = chunk.usage
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            content = choice.delta.content
+            if not content:
+                continue
+            
+            if detector.closed:
+                extra_chunks += 1
+                if extra_chunks > MAX_CHUNKS_AFTER_JSON:
+                    # The final usage chunk is never read, so this (costly)
+                    # response is missing from the token totals
+                    log.warning("     ⚠ Stopped reading a rambling response; its token usage was not reported")
+                    finish_reason = 'stop'
+                    break
+                continue
+            chunks.append(content)
+            detector.feed(content)
+    except httpx.TransportError as e:
+        # The body is read outside the SDK's retry/error wrapping: surface a
+        # dropped connection or read timeout as the SDK would, so the provider
+        # chain fails over instead of treating it as an answer
+        raise APIConnectionError(message=f"Streamed response interrupted: {e}", request=stream.response.request) from e
+    finally:
+        stream.close()
+    
+    if first_chunk is None:
+        raise ValueError("Empty streamed response")
+    
+    return ChatCompletion.model_validate({
+        'id': first_chunk.id,
+        'object': 'chat.completion',
+        'created': first_chunk.created,
+        'model': first_chunk.model,
+        'choices': [{
+            'index': 0,
+            'finish_reason': finish_reason or 'stop',
+            'message': {'role': 'assistant', 'content': ''.join(chunks)}
+        }],
+        'usage': usage.model_dump() if usage is not None else None
+    })
+
+# Prompt tokens served from the provider's prompt cache are billed at a
+# discount (50% on OpenAI/Azure), so they count at this weight in the totals
+CACHED_PROMPT_TOKEN_WEIGHT = 0.5
+
+def cached_prompt_tokens(usage):
+    """Return how many of a completion's prompt tokens were served from the prompt cache."""
+    details = getattr(usage, 'prompt_tokens_details', None)
+    return getattr(details, 'cached_tokens', 0) or 0
+
+def billed_token_count(usage):
+    """Return a completion's token total with cached prompt tokens at their discounted weight."""
+    cached = cached_prompt_tokens(usage)
+    billed_prompt = (usage.prompt_tokens - cached) + cached * CACHED_PROMPT_TOKEN_WEIGHT
+    return round(billed_prompt + usage.completion_tokens)
+
+def log_completion_usage(response, elapsed):
+    """Log a completion's latency and token usage; return its billed tokens (0 if unreported)."""
+    usage = getattr(response, 'usage', None)
+    if not usage:
+        log.info("     %.1fs", elapsed)
+        return 0
+    # Thousands separators are only formatted when the line is actually emitted
+    if log.isEnabledFor(logging.INFO):
+        cached = cached_prompt_tokens(usage)
+        if cached:
+            log.info("     %.1fs | %s→%s tokens (%s cached, %.0f%% of prompt)", elapsed,
+                     f"{usage.prompt_tokens:,}", f"{usage.completion_tokens:,}",
+                     f"{cached:,}", 100 * cached / usage.prompt_tokens)
+        else:
+            log.info("     %.1fs | %s→%s tokens", elapsed,
+                     f"{usage.prompt_tokens:,}", f"{usage.completion_tokens:,}")
+    return billed_token_count(usage)
+
+def log_token_count(message, count):
+    """Log message % count with thousands separators, formatting only when INFO is enabled."""
+    if log.isEnabledFor(logging.INFO):
+        log.info(message, f"{count:,}")
+
+def create_chat_completion(client, api_params):
+    """
+    Streamed client.chat.completions.create(**api_params), answered from
+    LLM_CACHE_DIR when the same request was already made; a cache error never
+    fails the call.
+    """
+    cache_path = _llm_cache_path(client, api_params)
+    if cache_path is not None and cache_path.exists():
+        try:
+            from openai.types.chat import ChatCompletion
+            response = ChatCompletion.model_validate(loads_json(cache_path.read_bytes()))
+            log.info("     Using cached response")
+            return response
+        except (OSError, ValueError) as e:
+            log.warning("     ⚠ Ignoring unreadable cached response: %s", e)
     
-    Returns: (speaker_info, total_tokens_used)
+    response = _stream_chat_completion(client, api_params)
+    
+    if cache_path is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            write_json_file(response.model_dump(mode='json'), cache_path, indent=False)
+        except (OSError, TypeError, ValueError) as e:
+            log.warning("     ⚠ Could not cache response: %s", e)
+    return response
+
+@functools.lru_cache(maxsize=1)
+def provider_failover_errors():
+    """
+    Transient provider failures (connection/timeouts, 5xx, 429) that move a
+    speaker-extraction request on to the next AI provider.
+    """
+    if not AZURE_OPENAI_AVAILABLE:
+        return ()
+    from openai import APIConnectionError, InternalServerError, RateLimitError
+    return (APIConnectionError, InternalServerError, RateLimitError)
+
+# Circuit breaker settings for speaker-extraction providers
+CIRCUIT_WINDOW = 20  # Recent calls considered per provider
+CIRCUIT_FAILURE_RATIO = 0.5  # Open the circuit when more than this share failed
+CIRCUIT_OPEN_SECONDS = 60  # How long an open circuit skips the provider
+
+class CircuitBreaker:
+    """
+    Thread-safe health tracker for one AI provider. The circuit opens when most
+    recent calls failed; once CIRCUIT_OPEN_SECONDS pass, a single probe call is
+    let through, which closes the circuit on success or reopens it on failure.
     """
-    print("\n🔍 Speaker Extraction (Multi-Pass)")
     
-    # Try Azure OpenAI GPT-4 first (PRIMARY)
-    client_info = setup_azure_openai_client()
-    if client_info:
-        client, deployment = client_info
-        provider = "Azure GPT-4"
-    else:
-        # Fallback to OpenAI API (SECONDARY)
-        client_info = setup_openai_client()
-        if client_info:
-            client, deployment = client_info
-            provider = f"OpenAI {deployment}"
-        else:
-            # Fallback to Ollama (TERTIARY)
-            client_info = setup_ollama_client()
-            if not client_info:
-                print("  ✗ No AI service available")
-                return None, 0
-            client, deployment = client_info
-            provider = "Ollama"
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=CIRCUIT_WINDOW)
+        self._open_until = 0.0
+        self._probing = False
+    
+    def allow(self):
+        """Return True if a call may be sent to the provider now."""
+        with self._lock:
+            if not self._open_until:
+                return True
+            if self._probing or time.monotonic() < self._open_until:
+                return False
+            self._probing = True  # half-open: this caller is the probe
+            return True
     
-    # Track total tokens
-    total_tokens_used = 0
+    def record(self, success):
+        """Record a call outcome and open or close the circuit accordingly."""
+        with self._lock:
+            self._probing = False
+            if success:
+                if self._open_until:
+                    self._outcomes.clear()
+                    self._open_until = 0.0
+                self._outcomes.append(True)
+                return
+            
+            self._outcomes.append(False)
+            failures = self._outcomes.count(False)
+            if self._open_until or failures > CIRCUIT_FAILURE_RATIO * len(self._outcomes):
+                self._open_until = time.monotonic() + CIRCUIT_OPEN_SECONDS
+
+# Speaker-extraction providers in priority order
+SPEAKER_PROVIDERS = (
+    ("Azure GPT-4", setup_azure_openai_client),  # PRIMARY
+    ("OpenAI", setup_openai_client),  # SECONDARY
+    ("Ollama", setup_ollama_client),  # TERTIARY
+)
+# Shared across runs, so a failing provider is skipped until its circuit closes
+_PROVIDER_BREAKERS = {name: CircuitBreaker() for name, _ in SPEAKER_PROVIDERS}
+
+def speaker_chat_params(provider, deployment, messages, max_tokens):
+    """Build chat completion parameters for a speaker-extraction provider."""
+    # GPT-5 only accepts default temperature/top_p, others allow customization
+    token_param = 'max_completion_tokens' if 'OpenAI' in provider else 'max_tokens'
+    
+    api_params = {
+        'model': deployment,
+        'messages': messages,
+        token_param: max_tokens
+    }
     
-    # Pass 1: Extract speaker mentions
-    print(f"  Pass 1: Mentions ({provider})")
-    pass1_prompt = f"""You are an expert in analyzing international meeting transcripts with focus on diplomatic and organizational contexts.
+    # Only add temperature/top_p for non-OpenAI providers (GPT-5 restriction)
+    if 'OpenAI' not in provider:
+        api_params['temperature'] = 0.1
+        api_params['top_p'] = 1.0
+    return api_params
+
+class SpeakerProviderChain:
+    """
+    Fallback chain over SPEAKER_PROVIDERS. Providers are only set up when an
+    earlier one is unavailable, failing or skipped by its circuit breaker.
+    """
+    
+    def __init__(self):
+        self._pending = iter(SPEAKER_PROVIDERS)
+        self._ready = []  # (name, provider label, client, deployment)
+        self.last_used = None  # (provider label, client, deployment) that answered last
+    
+    def primary(self):
+        """Return (provider label, client, deployment) of the first available provider, or None."""
+        for _, provider, client, deployment in self._providers():
+            return provider, client, deployment
+        return None
+    
+    def _providers(self):
+        yield from self._ready
+        for name, setup in self._pending:
+            client_info = setup()
+            if client_info:
+                client, deployment = client_info
+                provider = f"OpenAI {deployment}" if name == "OpenAI" else name
+                self._ready.append((name, provider, client, deployment))
+                yield self._ready[-1]
+    
+    def create(self, label, messages, max_tokens):
+        """
+        Send one chat request, failing over to the next provider on transient
+        errors. Returns the response; raises the last error if all providers fail.
+        """
+        failover_errors = provider_failover_errors()
+        last_error = None
+        for name, provider, client, deployment in self._providers():
+            breaker = _PROVIDER_BREAKERS[name]
+            if not breaker.allow():
+                log.warning("  ⚠ Skipping %s (circuit open after repeated failures)", provider)
+                continue
+            
+            log.info("  %s (%s)", label, provider)
+            try:
+                response = create_chat_completion(
+                    client, speaker_chat_params(provider, deployment, messages, max_tokens)
+                )
+            except failover_errors as e:
+                breaker.record(False)
+                log.warning("     ⚠ %s failed: %s", provider, e)
+                last_error = e
+                continue
+            except Exception:
+                # The provider answered (bad request, auth, ...): not a health problem
+                breaker.record(True)
+                raise
+            breaker.record(True)
+            self.last_used = (provider, client, deployment)
+            return response
+        
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError("No AI service available")
+
+# Static instructions for the two speaker-extraction passes. They go in the
+# system message so every request starts with the same token prefix, which
+# the provider's automatic prompt caching can reuse; only the transcript
+# excerpts (and Pass 1 results) vary, in the user message after it
+PASS1_SYSTEM_PROMPT = """You are an expert in analyzing international meeting transcripts with focus on diplomatic and organizational contexts.
 
 TASK: Extract ALL speaker mentions with maximum detail about their identity and affiliation.
 
@@ -379,18 +811,18 @@ Priority organizations: UN, WHO, World Bank, ITU, UNESCO, EU, African Union, ASE
 Priority country formats: "Dominican Republic", "United States", "People's Republic of China"
 
 Return a JSON object with this structure:
-{{
+{
     "speaker_mentions": [
-        {{
+        {
             "name": "Full name with any titles (e.g., 'Dr. Maria Rodriguez', 'Hon. John Smith')",
             "country": "Country they represent (if mentioned, otherwise null)",
             "organization": "Organization/Ministry they represent (if mentioned, otherwise null)",
             "context": "The complete sentence or phrase where they were mentioned",
             "mention_type": "self-introduction|third-party-introduction|reference|position-identifier",
             "confidence": "high|medium|low"
-        }}
+        }
     ]
-}}
+}
 
 CRITICAL RULES:
 1. Extract COMPLETE names - don't truncate titles or honorifics
@@ -398,82 +830,12 @@ CRITICAL RULES:
 3. For UN officials, extract their specific office/agency
 4. If unsure about country/org, set to null (don't guess)
 5. Mark confidence: high (explicit mention), medium (implied), low (unclear)
-6. Include ALL mentions, even if same person appears multiple times
-
-Transcript (strategic samples focusing on introductions):
-{extract_intro_sections(transcript_text, max_chars=50000)}
+6. Include ALL mentions, even if same person appears multiple times"""
 
-Return ONLY the JSON object. Be thorough - we need complete speaker information for accurate diarization."""
-
-    try:
-        start_time = time.time()
-        
-        # Build API parameters dynamically based on provider
-        # GPT-5 only accepts default temperature/top_p, others allow customization
-        token_param = 'max_completion_tokens' if 'OpenAI' in provider else 'max_tokens'
-        
-        api_params = {
-            'model': deployment,
-            'messages': [{"role": "user", "content": pass1_prompt}],
-            token_param: 10000
-        }
-        
-        # Only add temperature/top_p for non-OpenAI providers (GPT-5 restriction)
-        if 'OpenAI' not in provider:
-            api_params['temperature'] = 0.1
-            api_params['top_p'] = 1.0
-        
-        response1 = client.chat.completions.create(**api_params)
-        
-        elapsed = time.time() - start_time
-        
-        # Track tokens
-        if hasattr(response1, 'usage') and response1.usage:
-            total_tokens_used += response1.usage.total_tokens
-            print(f"     {elapsed:.1f}s | {response1.usage.prompt_tokens:,}→{response1.usage.completion_tokens:,} tokens")
-        else:
-            print(f"     {elapsed:.1f}s")
-        
-        mentions_text = response1.choices[0].message.content.strip()
-        
-        # Robust JSON extraction
-        if "```json" in mentions_text:
-            mentions_text = mentions_text.split("```json")[1].split("```")[0]
-        elif "```" in mentions_text:
-            mentions_text = mentions_text.split("```")[1].split("```")[0]
-        
-        mentions_text = mentions_text.strip()
-        
-        # Try to find JSON object if there's extra text
-        if not mentions_text.startswith('{'):
-            start = mentions_text.find('{')
-            if start != -1:
-                mentions_text = mentions_text[start:]
-        if not mentions_text.endswith('}'):
-            end = mentions_text.rfind('}')
-            if end != -1:
-                mentions_text = mentions_text[:end+1]
-        
-        speaker_mentions = json.loads(mentions_text)
-        print(f"     Found {len(speaker_mentions.get('speaker_mentions', []))} mentions")
-        
-    except Exception as e:
-        print(f"  ✗ Pass 1 failed: {e}")
-        return None, 0
-    
-    # Pass 2: Build comprehensive speaker profiles
-    print(f"  Pass 2: Profiles ({provider})")
-    pass2_prompt = f"""You are an expert in building comprehensive speaker profiles for international meetings, with deep knowledge of diplomatic protocols and organizational structures.
+PASS2_SYSTEM_PROMPT = """You are an expert in building comprehensive speaker profiles for international meetings, with deep knowledge of diplomatic protocols and organizational structures.
 
 TASK: Create validated, deduplicated speaker profiles with complete organizational context.
 
-INPUT DATA:
-Speaker Mentions from Pass 1 (compressed):
-{json.dumps(compress_speaker_mentions(speaker_mentions), separators=(',', ':'))}
-
-Relevant Transcript Sections (for validation):
-{extract_speaker_relevant_sections(transcript_text, speaker_mentions, max_chars=80000)}
-
 PROFILE BUILDING RULES:
 
 **Name Standardization:**
@@ -503,9 +865,9 @@ PROFILE BUILDING RULES:
 - Regional bodies → Region + organization (e.g., "African Union")
 
 Create a JSON object:
-{{
+{
     "speakers": [
-        {{
+        {
             "name": "Full standardized name with titles",
             "title": "Complete official title/position",
             "organization": "Full organization name (use official names, include acronyms)",
@@ -514,9 +876,9 @@ Create a JSON object:
             "description": "2-3 sentence description: their role, what they discussed, key expertise",
             "alternative_names": ["List", "of", "name", "variations", "found"],
             "confidence_score": "high|medium|low"
-        }}
+        }
     ]
-}}
+}
 
 VALIDATION CHECKLIST:
 ✓ Merge all variations of same person (check name similarity)
@@ -534,72 +896,278 @@ Bad: "DR", "WHO" (without full name), "Communications Ministry"
 
 Return ONLY the JSON object. Focus on accuracy over quantity - we need reliable speaker identification."""
 
+# Fixed text around the dynamic parts of the user messages, concatenated
+# directly instead of re-rendering an f-string template per call
+INTRO_PROMPT_HEAD = "Transcript (strategic samples focusing on introductions):\n"
+INTRO_PROMPT_TAIL = (
+    "\n\nReturn ONLY the JSON object. Be thorough - we need complete speaker "
+    "information for accurate diarization."
+)
+PASS2_MENTIONS_HEAD = "INPUT DATA:\nSpeaker Mentions from Pass 1 (compressed):\n"
+PASS2_SECTIONS_HEAD = "\n\nRelevant Transcript Sections (for validation):\n"
+
+# Output token budgets for speaker extraction, sized from the input instead of
+# always allowing the worst case, so a runaway completion is cut off early.
+# Pass 1 scales with mention cues in the excerpts (one mention object is
+# ~100 tokens), Pass 2 with the mentions Pass 1 returned
+PASS1_TOKENS_PER_CUE, PASS1_MIN_TOKENS, PASS1_MAX_TOKENS = 120, 1500, 10000
+PASS2_TOKENS_PER_MENTION, PASS2_MIN_TOKENS, PASS2_MAX_TOKENS = 200, 2000, 15000
+COMBINED_TOKENS_PER_CUE, COMBINED_MIN_TOKENS, COMBINED_MAX_TOKENS = 320, 3000, 16000
+
+# Phrases that usually accompany a speaker mention (titles, introductions, thanks)
+_MENTION_CUE_RE = re.compile(
+    r"\b(?:Dr|Prof|Hon|H\.E)\.|\b(?:minister|ambassador|director|representative|secretary|"
+    r"president|chair|delegate|my name is|welcome|thank you)\b",
+    re.IGNORECASE
+)
+
+def count_mention_cues(text):
+    """Count phrases in transcript text that usually accompany a speaker mention."""
+    return sum(1 for _ in _MENTION_CUE_RE.finditer(text))
+
+def speaker_output_budget(item_count, tokens_per_item, min_tokens, max_tokens):
+    """Scale an output token limit with the expected number of items, within bounds."""
+    return min(max_tokens, max(min_tokens, item_count * tokens_per_item))
+
+# Both passes' instructions in one request: the model extracts mentions and
+# builds profiles in a single response, paying for the transcript once
+COMBINED_SYSTEM_PROMPT = (
+    "Work in two steps and answer both in a single response:\n"
+    "STEP 1 - Extract ALL speaker mentions from the transcript (PASS 1 instructions).\n"
+    "STEP 2 - Build validated, deduplicated speaker profiles from those mentions "
+    "and the transcript (PASS 2 instructions).\n\n"
+    "=== PASS 1 INSTRUCTIONS ===\n"
+    + PASS1_SYSTEM_PROMPT
+    + "\n\n=== PASS 2 INSTRUCTIONS ===\n"
+    + PASS2_SYSTEM_PROMPT
+    + "\n\n=== OUTPUT ===\n"
+    "Return ONLY one JSON object holding both results, instead of the separate objects above:\n"
+    '{"speaker_mentions": [...STEP 1 mention objects...], "speakers": [...STEP 2 profile objects...]}'
+)
+
+def extract_speaker_info_single_pass(providers, transcript_text):
+    """
+    Single-call speaker extraction: mentions and profiles come back in one
+    JSON object. Returns: (speaker_info, total_tokens_used)
+    """
+    intro_sections = extract_intro_sections(transcript_text, max_tokens=20000)
+    user_prompt = INTRO_PROMPT_HEAD + intro_sections + INTRO_PROMPT_TAIL
+    
+    total_tokens_used = 0
     try:
         start_time = time.time()
         
-        # Build API parameters dynamically based on provider
-        # GPT-5 only accepts default temperature/top_p, others allow customization
-        token_param = 'max_completion_tokens' if 'OpenAI' in provider else 'max_tokens'
+        response = providers.create("Mentions + Profiles", [
+            {"role": "system", "content": COMBINED_SYSTEM_PROMPT},
+            {"role": "user", "content": user_prompt}
+        ], max_tokens=speaker_output_budget(
+            count_mention_cues(intro_sections), COMBINED_TOKENS_PER_CUE, COMBINED_MIN_TOKENS, COMBINED_MAX_TOKENS
+        ))
         
-        api_params = {
-            'model': deployment,
-            'messages': [{"role": "user", "content": pass2_prompt}],
-            token_param: 15000
-        }
+        elapsed = time.time() - start_time
         
-        # Only add temperature/top_p for non-OpenAI providers (GPT-5 restriction)
-        if 'OpenAI' not in provider:
-            api_params['temperature'] = 0.1
-            api_params['top_p'] = 1.0
+        # Track tokens
+        total_tokens_used += log_completion_usage(response, elapsed)
         
-        response2 = client.chat.completions.create(**api_params)
+        result_text = response.choices[0].message.content.strip()
+        result = decode_embedded_json(result_text, '{')
+        
+        speaker_info = {'speakers': result.get('speakers', [])}
+        num_speakers = len(speaker_info['speakers'])
+        log.info("     Found %d mentions, created %d speaker profiles", len(result.get('speaker_mentions', [])), num_speakers)
+        
+        # Only show details in verbose mode (debug level)
+        if num_speakers > 0 and log.isEnabledFor(logging.DEBUG):
+            for speaker in speaker_info['speakers'][:3]:
+                log.debug("       • %s", speaker.get('name', 'Unknown'))
+            if num_speakers > 3:
+                log.debug("       ... and %d more", num_speakers - 3)
+        
+        log_token_count("  📊 Total extraction tokens: %s", total_tokens_used)
+        return speaker_info, total_tokens_used
+        
+    except Exception as e:
+        log.error("  ✗ Speaker extraction failed: %s", e)
+        return None, total_tokens_used
+
+# Pass 2 only runs when Pass 1 found at least this many mentions
+PASS2_MIN_MENTIONS = 2
+
+def profiles_from_mentions(mentions):
+    """Build speaker profiles directly from Pass 1 mention records (used when Pass 2 is skipped)."""
+    return [
+        {
+            'name': mention['name'],
+            'title': None,
+            'organization': mention.get('organization'),
+            'country': mention.get('country'),
+            'affiliation_type': None,
+            'description': mention.get('context'),
+            'alternative_names': [],
+            'confidence_score': mention.get('confidence')
+        }
+        for mention in mentions
+        if mention.get('name')
+    ]
+
+def _pass2_artifact_path(transcript_text, mentions_json, provider_info, max_tokens):
+    """
+    Return the cached Pass 2 profiles file for this transcript + Pass 1 mentions
+    as answered by one provider (label, client, deployment), or None when
+    LLM_CACHE_DIR is unset or the provider's sampling is too hot to cache. The
+    key covers only Pass 2's inputs, so re-runs (or Pass 1 prompt tweaks that
+    yield the same mentions) skip Pass 2.
+    """
+    if not LLM_CACHE_DIR or provider_info is None:
+        return None
+    provider, client, deployment = provider_info
+    # Model, token budget and sampling exactly as the request sends them
+    api_params = speaker_chat_params(provider, deployment, None, max_tokens)
+    if not _is_cacheable_request(api_params):
+        return None
+    key = hashlib.sha256()
+    key.update(json.dumps(
+        {'endpoint': str(client.base_url), 'params': api_params},
+        sort_keys=True, separators=(',', ':'), ensure_ascii=False
+    ).encode('utf-8'))
+    for part in (PASS2_SYSTEM_PROMPT, PASS2_MENTIONS_HEAD, PASS2_SECTIONS_HEAD):
+        key.update(part.encode('utf-8'))
+    key.update(hashlib.sha256(transcript_text.encode('utf-8')).digest())
+    key.update(hashlib.sha256(mentions_json.encode('utf-8')).digest())
+    return Path(LLM_CACHE_DIR) / f"pass2-{key.hexdigest()}.json"
+
+def extract_speaker_info_with_gpt(transcript_text):
+    """
+    Speaker extraction with priority order:
+    1. Azure OpenAI (GPT-4) - PRIMARY
+    2. OpenAI API (GPT-5/GPT-4 Turbo) - SECONDARY
+    3. Ollama (Gemma 3) - TERTIARY
+    
+    By default a single call returns mentions and profiles together; with
+    SPEAKER_EXTRACTION_TWO_PASS the original two passes run instead:
+    Pass 1: Extract all speaker mentions and introductions
+    Pass 2: Build comprehensive speaker profiles with validation
+    
+    Returns: (speaker_info, total_tokens_used)
+    """
+    # Azure → OpenAI → Ollama, failing over per request
+    providers = SpeakerProviderChain()
+    
+    if not SPEAKER_EXTRACTION_TWO_PASS:
+        log.info("\n🔍 Speaker Extraction (Single Pass)")
+        return extract_speaker_info_single_pass(providers, transcript_text)
+    
+    log.info("\n🔍 Speaker Extraction (Multi-Pass)")
+    
+    # Track total tokens
+    total_tokens_used = 0
+    
+    # Pass 1: Extract speaker mentions
+    intro_sections = extract_intro_sections(transcript_text, max_tokens=12500)
+    pass1_user_prompt = INTRO_PROMPT_HEAD + intro_sections + INTRO_PROMPT_TAIL
+
+    try:
+        start_time = time.time()
+        
+        response1 = providers.create("Pass 1: Mentions", [
+            {"role": "system", "content": PASS1_SYSTEM_PROMPT},
+            {"role": "user", "content": pass1_user_prompt}
+        ], max_tokens=speaker_output_budget(
+            count_mention_cues(intro_sections), PASS1_TOKENS_PER_CUE, PASS1_MIN_TOKENS, PASS1_MAX_TOKENS
+        ))
         
         elapsed = time.time() - start_time
         
         # Track tokens
-        if hasattr(response2, 'usage') and response2.usage:
-            total_tokens_used += response2.usage.total_tokens
-            print(f"     {elapsed:.1f}s | {response2.usage.prompt_tokens:,}→{response2.usage.completion_tokens:,} tokens")
-        else:
-            print(f"     {elapsed:.1f}s")
+        total_tokens_used += log_completion_usage(response1, elapsed)
         
-        profiles_text = response2.choices[0].message.content.strip()
+        mentions_text = response1.choices[0].message.content.strip()
+        
+        # Decode the object in place, past any ```json fence or extra text
+        speaker_mentions = decode_embedded_json(mentions_text, '{')
+        log.info("     Found %d mentions", len(speaker_mentions.get('speaker_mentions', [])))
+        
+    except Exception as e:
+        log.error("  ✗ Pass 1 failed: %s", e)
+        return None, 0
+    
+    # With fewer than two mentions there is nothing to merge or cross-check, so
+    # Pass 2's full transcript prefill is skipped and the mention is used as is
+    mentions = speaker_mentions.get('speaker_mentions', [])
+    if len(mentions) < PASS2_MIN_MENTIONS:
+        speaker_info = {'speakers': profiles_from_mentions(mentions)}
+        log.info("  Pass 2: Skipped (%d mentions), created %d speaker profiles", len(mentions), len(speaker_info['speakers']))
+        log_token_count("  📊 Total extraction tokens: %s", total_tokens_used)
+        return speaker_info, total_tokens_used
+    
+    # Pass 2 is a pure function of the transcript and the Pass 1 mentions, so
+    # its profiles are reused when both are unchanged
+    mentions_json = dumps_json_compact(compress_speaker_mentions(speaker_mentions))
+    pass2_max_tokens = speaker_output_budget(
+        len(mentions), PASS2_TOKENS_PER_MENTION, PASS2_MIN_TOKENS, PASS2_MAX_TOKENS
+    )
+    artifact_path = _pass2_artifact_path(transcript_text, mentions_json, providers.primary(), pass2_max_tokens)
+    if artifact_path is not None and artifact_path.exists():
+        try:
+            speaker_info = loads_json(artifact_path.read_bytes())
+            if not isinstance(speaker_info, dict):
+                raise ValueError("cached profiles are not a JSON object")
+            log.info("  Pass 2: Using cached profiles (%d speakers)", len(speaker_info.get('speakers', [])))
+            log_token_count("  📊 Total extraction tokens: %s", total_tokens_used)
+            return speaker_info, total_tokens_used
+        except (OSError, ValueError) as e:
+            log.warning("     ⚠ Ignoring unreadable cached profiles: %s", e)
+    
+    # Pass 2: Build comprehensive speaker profiles
+    pass2_user_prompt = (
+        PASS2_MENTIONS_HEAD
+        + mentions_json
+        + PASS2_SECTIONS_HEAD
+        + extract_speaker_relevant_sections(transcript_text, speaker_mentions, max_tokens=20000)
+    )
+
+    try:
+        start_time = time.time()
         
-        # Robust JSON extraction
-        if "```json" in profiles_text:
-            profiles_text = profiles_text.split("```json")[1].split("```")[0]
-        elif "```" in profiles_text:
-            profiles_text = profiles_text.split("```")[1].split("```")[0]
+        response2 = providers.create("Pass 2: Profiles", [
+            {"role": "system", "content": PASS2_SYSTEM_PROMPT},
+            {"role": "user", "content": pass2_user_prompt}
+        ], max_tokens=pass2_max_tokens)
         
-        profiles_text = profiles_text.strip()
+        elapsed = time.time() - start_time
         
-        # Try to find JSON object if there's extra text
-        if not profiles_text.startswith('{'):
-            start = profiles_text.find('{')
-            if start != -1:
-                profiles_text = profiles_text[start:]
-        if not profiles_text.endswith('}'):
-            end = profiles_text.rfind('}')
-            if end != -1:
-                profiles_text = profiles_text[:end+1]
+        # Track tokens
+        total_tokens_used += log_completion_usage(response2, elapsed)
         
-        speaker_info = json.loads(profiles_text)
+        profiles_text = response2.choices[0].message.content.strip()
+        
+        # Decode the object in place, past any ```json fence or extra text
+        speaker_info = decode_embedded_json(profiles_text, '{')
         
         num_speakers = len(speaker_info.get('speakers', []))
-        print(f"     Created {num_speakers} speaker profiles")
+        log.info("     Created %d speaker profiles", num_speakers)
         
-        # Only show details in verbose mode
-        if VERBOSE and num_speakers > 0:
+        # Only show details in verbose mode (debug level)
+        if num_speakers > 0 and log.isEnabledFor(logging.DEBUG):
             for speaker in speaker_info.get('speakers', [])[:3]:
-                print(f"       • {speaker.get('name', 'Unknown')}")
+                log.debug("       • %s", speaker.get('name', 'Unknown'))
             if num_speakers > 3:
-                print(f"       ... and {num_speakers - 3} more")
+                log.debug("       ... and %d more", num_speakers - 3)
         
-        print(f"  📊 Total extraction tokens: {total_tokens_used:,}")
+        # Keyed on the provider that actually answered (possibly a fallback)
+        artifact_path = _pass2_artifact_path(transcript_text, mentions_json, providers.last_used, pass2_max_tokens)
+        if artifact_path is not None:
+            try:
+                artifact_path.parent.mkdir(parents=True, exist_ok=True)
+                write_json_file(speaker_info, artifact_path, indent=False)
+            except (OSError, TypeError, ValueError) as e:
+                log.warning("     ⚠ Could not cache profiles: %s", e)
+        
+        log_token_count("  📊 Total extraction tokens: %s", total_tokens_used)
         return speaker_info, total_tokens_used
         
     except Exception as e:
-        print(f"  ✗ Pass 2 failed: {e}")
+        log.error("  ✗ Pass 2 failed: %s", e)
         return None, total_tokens_used
 
 
@@ -621,16 +1189,25 @@ def compress_batch_for_llm(batch_data):
 
 def format_compressed_batch(compressed_data):
     """
-    Format for LLM: Use compact JSON array notation
-    Example: [[360,"principles."],[361,"Two, bolster"]]
+    Format for LLM: header-once tabular rows, no per-row brackets or quotes
+    Example: seg[2]{i,t}:\n360|principles.\n361|Two, bolster
     """
-    return json.dumps(compressed_data, separators=(',', ':'), ensure_ascii=False)
+    rows = []
+    for index, text in compressed_data:
+        # Escape the column separator and carriage returns (newlines are
+        # already escaped by compress_batch_for_llm)
+        text = text.replace('|', '\\|').replace('\r', '\\r')
+        rows.append(f"{index}|{text}")
+    return f"seg[{len(rows)}]{{i,t}}:\n" + "\n".join(rows)
+
+# One "index|speaker" row of a tabular batch response
+_TABULAR_ROW_RE = re.compile(r'^[ \t]*(\d+)[ \t]*\|(.*)$', re.MULTILINE)
 
 def decompress_batch_response(response_text, original_batch):
     """
     Parse LLM response and map back to full structure
-    Handles both compressed format [[index, speaker], ...] and full JSON fallback
-    With robust regex fallback for malformed JSON
+    Handles tabular rows (index|speaker), compressed format [[index, speaker], ...]
+    and full JSON fallback, with robust regex fallback for malformed JSON
     """
     try:
         # Clean response text
@@ -644,6 +1221,24 @@ def decompress_batch_response(response_text, original_batch):
         
         result_text = result_text.strip()
         
+        # Tabular format: optional spk[N]{i,s}: header, then index|speaker rows
+        if not result_text.startswith('['):
+            rows = _TABULAR_ROW_RE.findall(result_text)
+            if rows:
+                filled_batch = original_batch.copy()
+                speaker_map = {
+                    int(idx): speaker.replace('\\|', '|').strip()
+                    for idx, speaker in rows
+                }
+                
+                # Map speakers back to segments
+                for seg in filled_batch:
+                    seg_idx = seg.get('index', 0)
+                    if seg_idx in speaker_map:
+                        seg['speaker'] = speaker_map[seg_idx]
+                
+                return filled_batch
+        
         # Try to find JSON array if there's extra text
         if not result_text.startswith('['):
             start = result_text.find('[')
@@ -654,7 +1249,7 @@ def decompress_batch_response(response_text, original_batch):
             if end != -1:
                 result_text = result_text[:end+1]
         
-        parsed = json.loads(result_text)
+        parsed = loads_json(result_text)
         
         # Check if it's compressed format [[idx, speaker], ...]
         if isinstance(parsed, list) and len(parsed) > 0:
@@ -719,52 +1314,80 @@ def decompress_batch_response(response_text, original_batch):
     # If all parsing fails, return original with empty speakers
     return original_batch
 
-def extract_intro_sections(transcript_text, max_chars=50000):
+# Phrases that tend to surround speaker introductions, compiled once
+_INTRO_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'(?:my name is|i am|this is|representing|from)',
+        r'(?:please welcome|introducing|joining us)',
+        r'(?:minister|ambassador|director|representative)',
+    )
+]
+
+class CoveredSpans:
+    """
+    Sorted, merged [start, end) character spans of a transcript, so a candidate
+    position can be checked against everything already taken in O(log n).
+    """
+    
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+    
+    def covers(self, pos):
+        """Return True if pos lies inside a recorded span."""
+        i = bisect.bisect_right(self._starts, pos) - 1
+        return i >= 0 and pos < self._ends[i]
+    
+    def add(self, start, end):
+        """Record [start, end), merging it with any spans it overlaps or touches."""
+        lo = bisect.bisect_left(self._ends, start)
+        hi = bisect.bisect_right(self._starts, end)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            end = max(end, self._ends[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._ends[lo:hi] = [end]
+
+def extract_intro_sections(transcript_text, max_tokens=12500):
     """
     Extract sections most likely to contain speaker introductions:
     1. First 15k chars (opening/introductions)
     2. Sections with intro patterns
     3. Random samples from middle/end
     """
-    intro_patterns = [
-        r'(?:my name is|i am|this is|representing|from)',
-        r'(?:please welcome|introducing|joining us)',
-        r'(?:minister|ambassador|director|representative)',
-    ]
-    
     sections = []
     
+    # Sections are (start, end) offsets, sliced only once they are kept
     # Always include beginning (where most intros happen)
-    sections.append(('beginning', transcript_text[:15000]))
+    sections.append((0, 15000))
     
     # Find sections with intro patterns
-    for pattern in intro_patterns:
-        matches = list(re.finditer(pattern, transcript_text, re.IGNORECASE))
-        for match in matches[:5]:  # Top 5 matches per pattern
+    for pattern in _INTRO_PATTERNS:
+        for match in islice(pattern.finditer(transcript_text), 5):  # Top 5 matches per pattern
             start = max(0, match.start() - 500)
             end = min(len(transcript_text), match.end() + 2000)
-            sections.append((f'intro_{match.start()}', transcript_text[start:end]))
+            sections.append((start, end))
     
     # Add random samples if still under limit
     total_len = len(transcript_text)
     if total_len > 30000:
         for _ in range(3):
             start = random.randint(15000, total_len - 5000)
-            sections.append((f'sample_{start}', transcript_text[start:start+5000]))
+            sections.append((start, start + 5000))
     
-    # Combine and deduplicate (keep first occurrence of overlapping sections)
+    # Combine and deduplicate (keep first occurrence of overlapping sections):
+    # a section starting inside text that is already included is skipped
     combined_sections = []
-    seen_positions = set()
+    covered = CoveredSpans()
     
-    for name, text in sections:
-        # Simple deduplication: check if we've seen similar content
-        text_hash = hash(text[:100])  # Hash first 100 chars
-        if text_hash not in seen_positions:
-            seen_positions.add(text_hash)
-            combined_sections.append(text)
+    for start, end in sections:
+        if covered.covers(start):
+            continue
+        covered.add(start, end)
+        combined_sections.append(transcript_text[start:end])
     
     combined = "\n\n[...]\n\n".join(combined_sections)
-    return combined[:max_chars]
+    return truncate_to_tokens(combined, max_tokens)
 
 def compress_speaker_mentions(speaker_mentions):
     """
@@ -781,13 +1404,24 @@ def compress_speaker_mentions(speaker_mentions):
         })
     return {'m': compressed}  # 'm' instead of 'speaker_mentions'
 
-def extract_speaker_relevant_sections(transcript_text, speaker_mentions=None, max_chars=80000):
+def dedupe_passages(passages):
+    """Return passages in order, keeping only the first copy of identical text."""
+    seen = set()
+    unique = []
+    for passage in passages:
+        digest = hashlib.blake2b(passage.encode('utf-8'), digest_size=8).digest()
+        if digest not in seen:
+            seen.add(digest)
+            unique.append(passage)
+    return unique
+
+def extract_speaker_relevant_sections(transcript_text, speaker_mentions=None, max_tokens=20000):
     """
     For Pass 2: Extract only sections where identified speakers appear
     """
     if not speaker_mentions:
         # Fallback to intro extraction
-        return extract_intro_sections(transcript_text, max_chars)
+        return extract_intro_sections(transcript_text, max_tokens)
     
     # Build search patterns from identified speakers
     names = [m.get('name', '') for m in speaker_mentions.get('speaker_mentions', []) if m.get('name')]
@@ -796,45 +1430,53 @@ def extract_speaker_relevant_sections(transcript_text, speaker_mentions=None, ma
     
     # Find all sections mentioning these entities
     relevant_sections = []
-    seen_positions = set()
-    
-    # Search for each name/country/org (limit to avoid too many matches)
-    search_terms = names[:10] + countries[:5] + orgs[:5]
-    
-    for term in search_terms:
-        if not term or len(term) < 3:
-            continue
+    # Positions within 1000 chars of an accepted match, i.e. [pos - 999, pos + 1000)
+    seen_positions = CoveredSpans()
+    
+    # Search for each name/country/org (limit to avoid too many matches),
+    # case-insensitively deduplicated and skipping very short terms
+    search_terms = list(dict.fromkeys(
+        term.lower() for term in names[:10] + countries[:5] + orgs[:5] if len(term) >= 3
+    ))
+    if search_terms:
+        # One alternation scan instead of a pass per term; longer terms first so
+        # "Republic of Korea" wins over "Korea" at the same position. Word
+        # boundaries avoid partial matches
+        pattern = re.compile(
+            r'\b(?:' + '|'.join(re.escape(term) for term in sorted(search_terms, key=len, reverse=True)) + r')\b',
+            re.IGNORECASE
+        )
+        matches_per_term = {}
         
-        # Use word boundaries to avoid partial matches
-        try:
-            pattern = r'\b' + re.escape(term) + r'\b'
-            matches = list(re.finditer(pattern, transcript_text, re.IGNORECASE))
+        for match in pattern.finditer(transcript_text):
+            term = match.group().lower()
+            if matches_per_term.get(term, 0) >= 3:  # Top 3 matches per term
+                continue
+            matches_per_term[term] = matches_per_term.get(term, 0) + 1
             
-            for match in matches[:3]:  # Top 3 matches per term
-                pos = match.start()
-                # Avoid overlapping sections
-                if any(abs(pos - seen) < 1000 for seen in seen_positions):
-                    continue
-                
-                seen_positions.add(pos)
-                start = max(0, pos - 1000)  # 1k chars before
-                end = min(len(transcript_text), pos + 3000)  # 3k chars after
-                relevant_sections.append((start, transcript_text[start:end]))
-        except re.error:
-            continue
+            pos = match.start()
+            # Avoid overlapping sections
+            if seen_positions.covers(pos):
+                continue
+            
+            seen_positions.add(pos - 999, pos + 1000)
+            start = max(0, pos - 1000)  # 1k chars before
+            end = min(len(transcript_text), pos + 3000)  # 3k chars after
+            relevant_sections.append((start, transcript_text[start:end]))
     
     # Sort by position and combine
     relevant_sections.sort(key=lambda x: x[0])
     
-    # Combine sections with markers
-    combined = "\n\n[... section break ...]\n\n".join([s[1] for s in relevant_sections])
+    # Combine sections with markers, sending verbatim-repeated passages
+    # (e.g. boilerplate thanks around the same speaker) only once
+    combined = "\n\n[... section break ...]\n\n".join(dedupe_passages(s[1] for s in relevant_sections))
     
     # Always include beginning (opening remarks)
     beginning = transcript_text[:10000]
     if beginning not in combined:
         combined = beginning + "\n\n[...]\n\n" + combined
     
-    return combined[:max_chars]
+    return truncate_to_tokens(combined, max_tokens)
 
 def create_speaker_lookup_table(speaker_info):
     """
@@ -915,6 +1557,13 @@ def create_compact_previous_context(all_filled_segments, window=30):
     
     return f"RECENT:{','.join(sorted(recent_speakers))}\n"
 
+# Speaker change indicators, matched anywhere in the lowercased segment text
+_CHANGE_INDICATOR_RE = re.compile('|'.join(re.escape(indicator) for indicator in (
+    'thank you', 'thanks', 'next speaker', 'now we have',
+    'moving on', 'i would like to', 'my name is',
+    'i am', "i'm from", 'representing'
+)))
+
 def detect_speaker_boundaries(segments, global_context):
     """
     Detect likely speaker change points in the transcript.
@@ -924,14 +1573,6 @@ def detect_speaker_boundaries(segments, global_context):
     
     for i in range(1, len(segments)):
         current_text = segments[i]['text'].lower()
-        prev_text = segments[i-1]['text'].lower() if i > 0 else ""
-        
-        # Detect speaker change indicators
-        change_indicators = [
-            'thank you', 'thanks', 'next speaker', 'now we have',
-            'moving on', 'i would like to', 'my name is',
-            'i am', "i'm from", 'representing'
-        ]
         
         # Check for significant pause (time gap)
         if i > 0:
@@ -953,14 +1594,32 @@ def detect_speaker_boundaries(segments, global_context):
                 pass
         
         # Check for change indicators in text
-        for indicator in change_indicators:
-            if indicator in current_text:
-                boundaries.append(i)
-                break
+        if _CHANGE_INDICATOR_RE.search(current_text):
+            boundaries.append(i)
     
     return sorted(set(boundaries))
 
 
+def build_batch_prompt(batch_data, batch_number, total_batches, global_speaker_context, previous_speaker_context):
+    """Build the diarization prompt for one batch, with its segments as index|text rows."""
+    # Compress batch to minimal format
+    compressed_batch = compress_batch_for_llm(batch_data)
+    batch_string = format_compressed_batch(compressed_batch)
+    
+    return f"""Diarize batch {batch_number}/{total_batches}.
+
+{global_speaker_context}
+
+{previous_speaker_context}
+
+Format: seg[N]{{i,t}}: header, then one index|text row per segment
+Return: spk[N]{{i,s}}: header, then one index|speaker row per segment
+
+Input:
+{batch_string}
+
+Rules: Use exact names from SPK when recognized. Fill speaker for every segment."""
+
 def fill_speakers_in_batch_gpt(batch_data, batch_number, total_batches, global_speaker_context, previous_speaker_context):
     """
     Enhanced batch processing with priority order:
@@ -993,23 +1652,7 @@ def fill_speakers_in_batch_gpt(batch_data, batch_number, total_batches, global_s
             client, deployment = client_info
             provider = "Ollama"
     
-    # Compress batch to minimal format
-    compressed_batch = compress_batch_for_llm(batch_data)
-    batch_string = format_compressed_batch(compressed_batch)
-    
-    prompt = f"""Diarize batch {batch_number}/{total_batches}.
-
-{global_speaker_context}
-
-{previous_speaker_context}
-
-Format: [[index,text],...]
-Return: [[index,speaker],...] (one array per segment)
-
-Input:
-{batch_string}
-
-Rules: Use exact names from SPK when recognized. Fill speaker for every segment."""
+    prompt = build_batch_prompt(batch_data, batch_number, total_batches, global_speaker_context, previous_speaker_context)
 
     # Estimate input tokens
     input_tokens = len(prompt.split()) * 1.3  # Rough estimate
@@ -1044,32 +1687,19 @@ Rules: Use exact names from SPK when recognized. Fill speaker for every segment.
                 prompt_tokens = response.usage.prompt_tokens
                 completion_tokens = response.usage.completion_tokens
                 total_tokens = response.usage.total_tokens
-                tokens_used = total_tokens
-                print(f"  ✓ {provider} | {elapsed:.1f}s | Tokens: {prompt_tokens:,}→{completion_tokens:,} (Total: {total_tokens:,})")
-            else:
-                print(f"  ✓ {provider} | {elapsed:.1f}s | Tokens: ~{int(input_tokens):,} (estimated)")
+                tokens_used = billed_token_count(response.usage)
+                if log.isEnabledFor(logging.INFO):
+                    cached_tokens = cached_prompt_tokens(response.usage)
+                    cache_note = f", {cached_tokens:,} cached" if cached_tokens else ""
+                    log.info("  ✓ %s | %.1fs | Tokens: %s→%s (Total: %s%s)", provider, elapsed,
+                             f"{prompt_tokens:,}", f"{completion_tokens:,}", f"{total_tokens:,}", cache_note)
+            elif log.isEnabledFor(logging.INFO):
+                log.info("  ✓ %s | %.1fs | Tokens: ~%s (estimated)", provider, elapsed, f"{int(input_tokens):,}")
             
             result_text = response.choices[0].message.content.strip()
             
-            # Robust JSON extraction
-            if "```json" in result_text:
-                result_text = result_text.split("```json")[1].split("```")[0]
-            elif "```" in result_text:
-                result_text = result_text.split("```")[1].split("```")[0]
-            
-            result_text = result_text.strip()
-            
-            # Try to find JSON array if there's extra text
-            if not result_text.startswith('['):
-                start = result_text.find('[')
-                if start != -1:
-                    result_text = result_text[start:]
-            if not result_text.endswith(']'):
-                end = result_text.rfind(']')
-                if end != -1:
-                    result_text = result_text[:end+1]
-            
-            # Use decompression function to handle both formats
+            # Use decompression function to handle all formats (it strips
+            # code fences and extra text itself)
             filled_data = decompress_batch_response(result_text, batch_data)
             
             # Validate segment count
@@ -1236,8 +1866,8 @@ def fill_speakers_with_gpt_enhanced(transcript_data, global_speaker_context, spe
         i = batch_end - BATCH_OVERLAP_SIZE if batch_end < len(transcript_data) else batch_end
         batch_num += 1
     
-    print(f"\n✅ Diarization complete: {len(all_filled_segments)} segments")
-    print(f"   📊 Total diarization tokens: {total_tokens_used:,}")
+    log.info("\n✅ Diarization complete: %d segments", len(all_filled_segments))
+    log_token_count("   📊 Total diarization tokens: %s", total_tokens_used)
     
     return all_filled_segments, total_tokens_used
 
@@ -1252,9 +1882,11 @@ def _slug_to_entry_id(slug: str) -> str:
         raise ValueError(f"Unexpected slug format: {slug}")
     return "1_" + slug[2:]
 
+_SLUG_RE = re.compile(r"/asset/[^/]+/([A-Za-z0-9]+)$")
+
 def _extract_slug(url: str) -> str:
     """Extract the slug from a UN WebTV URL."""
-    m = re.search(r"/asset/[^/]+/([A-Za-z0-9]+)$", url)
+    m = _SLUG_RE.search(url)
     if not m:
         raise ValueError("URL does not look like a UN Web TV asset link.")
     return m.group(1)
@@ -1354,12 +1986,13 @@ def download_audio_youtube_enhanced(url: str, out_dir: str) -> Tuple[Path, Dict]
             {
                 'key': 'FFmpegExtractAudio',
                 'preferredcodec': 'mp3',
-                'preferredquality': '192',
+                'preferredquality': MP3_VBR_QUALITY,
             }
         ],
+        'postprocessor_args': YTDLP_POSTPROCESSOR_ARGS,
         'no_warnings': False,
         'quiet': False,
-        'writeinfojson': True,
+        'writeinfojson': False,  # The info dict is kept in memory instead
         
         # Anti-detection measures for YouTube
         'user_agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -1394,6 +2027,7 @@ def download_audio_youtube_enhanced(url: str, out_dir: str) -> Tuple[Path, Dict]
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             # First, extract info to see available formats
+            info = None
             try:
                 print("Extracting YouTube video information...")
                 info = ydl.extract_info(url, download=False)
@@ -1431,14 +2065,13 @@ def download_audio_youtube_enhanced(url: str, out_dir: str) -> Tuple[Path, Dict]
                     'extraction_method': 'yt-dlp enhanced YouTube'
                 }
             
-            # Download with enhanced options
+            # Download with enhanced options, reusing the extracted info
+            # instead of resolving the URL a second time
             print("Starting YouTube audio download...")
-            ydl.download([url])
-            
-            # Clean up info.json file
-            info_json_path = out_dir / f"audio.info.json"
-            if info_json_path.exists():
-                info_json_path.unlink()
+            if info is not None:
+                ydl.process_ie_result(info, download=True)
+            else:
+                ydl.download([url])
                 
             # Ensure we have the MP3 file
             if not audio_path.exists():
@@ -1492,6 +2125,7 @@ def download_audio_youtube_fallback(url: str, out_dir: str) -> Tuple[Path, Dict]
                 'preferredquality': '128',
             }
         ],
+        'postprocessor_args': YTDLP_POSTPROCESSOR_ARGS,
         'no_warnings': True,
         'quiet': True,
         'writeinfojson': False,
@@ -1566,12 +2200,13 @@ def _download_with_yt_dlp(download_url: str, out_dir: Path, format_selectors: li
             {
                 'key': 'FFmpegExtractAudio',
                 'preferredcodec': 'mp3',
-                'preferredquality': '192',
+                'preferredquality': MP3_VBR_QUALITY,
             }
         ],
+        'postprocessor_args': YTDLP_POSTPROCESSOR_ARGS,
         'no_warnings': False,
         'quiet': False,
-        'writeinfojson': True,  # This helps us see what languages are available
+        'writeinfojson': False,  # The info dict is kept in memory instead
     }
     
     metadata = {}
@@ -1579,6 +2214,7 @@ def _download_with_yt_dlp(download_url: str, out_dir: Path, format_selectors: li
     try:
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
             # First, extract info to see available formats
+            info = None
             try:
                 info = ydl.extract_info(download_url, download=False)
                 formats = info.get('formats', [])
@@ -1607,13 +2243,12 @@ def _download_with_yt_dlp(download_url: str, out_dir: Path, format_selectors: li
                     **extra_metadata
                 }
             
-            # Download with format selector
-            ydl.download([download_url])
-            
-            # Clean up info.json file
-            info_json_path = out_dir / f"audio.info.json"
-            if info_json_path.exists():
-                info_json_path.unlink()
+            # Download with format selector, reusing the extracted info
+            # instead of resolving the URL a second time
+            if info is not None:
+                ydl.process_ie_result(info, download=True)
+            else:
+                ydl.download([download_url])
                 
             # Ensure we have the MP3 file
             if not audio_path.exists():
@@ -1670,7 +2305,7 @@ def handle_uploaded_audio_file(url: str, out_dir: str) -> Tuple[Path, Dict]:
         print("MP3 file already exists, using it directly")
         metadata = {
             'title': 'Uploaded Audio File',
-            'duration': 0,  # We'll try to get this from the file
+            'duration': 0,  # Duration will be determined during transcription
             'uploader': 'Direct Upload',
             'source_type': 'File Upload',
             'extraction_method': 'direct_upload',
@@ -1693,33 +2328,42 @@ def handle_uploaded_audio_file(url: str, out_dir: str) -> Tuple[Path, Dict]:
         
         print(f"Converting {source_file.name} to MP3 format...")
         
-        # Use FFmpeg to convert to MP3 if available, otherwise copy/rename
+        # Whisper decodes audio through ffmpeg too, so a missing binary is fatal here
+        if FFMPEG_PATH is None:
+            raise Exception("ffmpeg is not installed. Please install it to process uploaded audio files.")
+        
         try:
-            import subprocess
-            
-            # Try to convert using FFmpeg
+            # Convert using FFmpeg
             cmd = [
-                'ffmpeg', '-i', str(source_file), 
+                FFMPEG_PATH, '-nostats', '-loglevel', 'error',
+                '-i', str(source_file), 
                 '-acodec', 'mp3', '-ab', '192k', 
                 '-ar', '44100', '-ac', '2',
                 '-y',  # Overwrite output file
                 str(audio_path)
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            # Only stderr is piped, and it is only decoded when the conversion fails
+            result = subprocess.run(
+                cmd,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                timeout=300
+            )
             
             if result.returncode == 0:
                 print("Successfully converted to MP3 using FFmpeg")
                 # Remove the original file
                 source_file.unlink()
             else:
-                print(f"FFmpeg conversion failed: {result.stderr}")
+                print(f"FFmpeg conversion failed: {result.stderr.decode('utf-8', errors='replace')}")
                 # Fallback: just rename the file (may not be true MP3 but worth trying)
                 source_file.rename(audio_path)
                 print("Renamed file to MP3 extension (conversion may be needed later)")
                 
-        except (subprocess.TimeoutExpired, FileNotFoundError, Exception) as e:
-            print(f"FFmpeg not available or conversion failed: {e}")
+        except subprocess.TimeoutExpired as e:
+            print(f"FFmpeg conversion timed out: {e}")
             # Fallback: just rename the file
             source_file.rename(audio_path)
             print("Renamed file to MP3 extension (conversion may be needed later)")
@@ -1735,29 +2379,34 @@ def handle_uploaded_audio_file(url: str, out_dir: str) -> Tuple[Path, Dict]:
             'file_size': audio_path.stat().st_size
         }
     
-    # Try to get duration if possible
-    try:
-        import subprocess
-        cmd = ['ffprobe', '-v', 'quiet', '-show_entries', 'format=duration', 
-               '-of', 'csv=p=0', str(audio_path)]
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-        if result.returncode == 0 and result.stdout.strip():
-            metadata['duration'] = float(result.stdout.strip())
-            print(f"Detected audio duration: {metadata['duration']:.1f} seconds")
-    except Exception as e:
-        print(f"Could not determine audio duration: {e}")
-        metadata['duration'] = 0
-    
+    # Duration is filled in from the Whisper result after transcription
     print(f"Uploaded file processing complete: {metadata['file_size']} bytes")
     return audio_path, metadata
 
-def transcribe_audio(audio_path: Path, out_dir: str, model_size: str = "medium.en") -> Tuple[Path, Path]:
+def cuda_available() -> bool:
+    """Check for a CUDA device via torch, or via CTranslate2 when torch is absent"""
+    if TORCH_AVAILABLE:
+        return torch.cuda.is_available()
+    if FASTER_WHISPER_AVAILABLE:
+        return ctranslate2.get_cuda_device_count() > 0
+    return False
+
+# Whisper models consume 16 kHz mono float32 audio
+WHISPER_SAMPLE_RATE = 16000
+
+def load_whisper_audio(audio_path: Path):
+    """Decode an audio file once to a 16 kHz mono float32 array for Whisper and its VAD"""
+    if FASTER_WHISPER_AVAILABLE:
+        return decode_audio(str(audio_path), sampling_rate=WHISPER_SAMPLE_RATE)
+    return whisper.load_audio(str(audio_path), sr=WHISPER_SAMPLE_RATE)
+
+def transcribe_audio(audio_path: Path, out_dir: str, model_size: str = "medium.en") -> Tuple[Path, Path, float]:
     """
     Enhanced transcription with GPU support and better error handling
-    Returns: (transcript_path, srt_path)
+    Returns: (transcript_path, srt_path, duration_seconds)
     """
-    if not WHISPER_AVAILABLE:
-        raise Exception("openai-whisper is not installed. Please install it to enable transcription.")
+    if not (FASTER_WHISPER_AVAILABLE or WHISPER_AVAILABLE):
+        raise Exception("Neither faster-whisper nor openai-whisper is installed. Please install one to enable transcription.")
     
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -1775,7 +2424,7 @@ def transcribe_audio(audio_path: Path, out_dir: str, model_size: str = "medium.e
         use_gpu = use_gpu_str.lower() in ('true', '1', 'yes', 'on')
         
         # Use GPU if enabled and available
-        if use_gpu and TORCH_AVAILABLE and torch.cuda.is_available():
+        if use_gpu and cuda_available():
             device = "cuda"
             print(f"✓ GPU enabled - Loading Whisper model '{model_size}' on CUDA")
         else:
@@ -1785,78 +2434,277 @@ def transcribe_audio(audio_path: Path, out_dir: str, model_size: str = "medium.e
             else:
                 print(f"GPU disabled - Using CPU for transcription")
         
-        print(f"Loading Whisper model '{model_size}' on {device.upper()}")
-        
-        # Load Whisper model
-        model = whisper.load_model(model_size, device=device)
-        
-        # Transcribe with English language specification
-        print(f"Transcribing audio using {device.upper()}")
-        result = model.transcribe(str(audio_path), language="en", verbose=False)
-        
-        # Save raw transcript
+        # Decode and resample once up front; both backends accept the array
+        # directly instead of spawning their own decoder on the MP3
+        print(f"Decoding audio to {WHISPER_SAMPLE_RATE // 1000} kHz mono")
+        audio = load_whisper_audio(audio_path)
+        # Exact audio length: segment ends stop at the last detected speech,
+        # missing trailing applause, music or silence
+        duration = len(audio) / WHISPER_SAMPLE_RATE
+        
+        if FASTER_WHISPER_AVAILABLE:
+            # CTranslate2 backend: int8 weights, with FP16 activations on CUDA
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            print(f"Loading faster-whisper model '{model_size}' on {device.upper()} ({compute_type})")
+            model = WhisperModel(model_size, device=device, compute_type=compute_type, cpu_threads=os.cpu_count() or 0)
+            
+            # Fixed language skips detection; greedy decoding without
+            # conditioning on the previous window keeps the decoder cheap.
+            # Silero VAD drops silence/applause before the encoder runs
+            # (segment timestamps are still reported on the original timeline)
+            transcribe_options = dict(
+                language="en",
+                beam_size=1,
+                condition_on_previous_text=False,
+                vad_filter=True,
+                vad_parameters=dict(min_silence_duration_ms=500)
+            )
+            if device == "cuda":
+                # On GPU, decode several VAD chunks per forward pass to keep the tensor cores busy
+                try:
+                    from flask import current_app
+                    batch_size = int(current_app.config.get('WHISPER_BATCH_SIZE', 16))
+                except RuntimeError:
+                    batch_size = int(os.environ.get('WHISPER_BATCH_SIZE', 16))
+                print(f"Transcribing audio using {device.upper()} (batch size {batch_size})")
+                segments_iter, _info = BatchedInferencePipeline(model=model).transcribe(
+                    audio,
+                    batch_size=batch_size,
+                    **transcribe_options
+                )
+            else:
+                print(f"Transcribing audio using {device.upper()}")
+                segments_iter, _info = model.transcribe(audio, **transcribe_options)
+            # Lazy generator: decoding happens as the writer loop below consumes it
+            segments = ((segment.start, segment.end, segment.text) for segment in segments_iter)
+        else:
+            print(f"Loading Whisper model '{model_size}' on {device.upper()}")
+            
+            # Load Whisper model
+            model = whisper.load_model(model_size, device=device)
+            
+            # Transcribe with English language specification
+            print(f"Transcribing audio using {device.upper()}")
+            # No autograd bookkeeping; FP16 on CUDA, explicit FP32 on CPU to avoid Whisper's warning
+            with torch.inference_mode():
+                result = model.transcribe(
+                    audio,
+                    language="en",
+                    verbose=False,
+                    fp16=(device == "cuda")
+                )
+            segments = ((segment['start'], segment['end'], segment['text']) for segment in result['segments'])
+        
+        # Write the raw transcript and the SRT file segment by segment, so no
+        # full result list or joined text has to be held before any I/O
         transcript_path = out_dir / 'transcript.txt'
-        with open(transcript_path, 'w', encoding='utf-8') as f:
-            f.write(result['text'].strip())
-        
-        # Generate enhanced SRT file
         srt_path = out_dir / 'transcript.srt'
-        with open(srt_path, 'w', encoding='utf-8') as f:
-            for i, segment in enumerate(result['segments'], 1):
-                start_time = format_srt_time(segment['start'])
-                end_time = format_srt_time(segment['end'])
-                text = segment['text'].strip()
+        segment_count = 0
+        text_chars = 0
+        pending = ''
+        # 1 MiB buffers: thousands of small per-segment writes flush in a few syscalls
+        with open(transcript_path, 'w', encoding='utf-8', buffering=SEGMENT_WRITE_BUFFER) as transcript_file, \
+                open(srt_path, 'w', encoding='utf-8', buffering=SEGMENT_WRITE_BUFFER) as srt_file:
+            for segment_count, (start, end, text) in enumerate(segments, 1):
+                # Raw transcript is the stripped concatenation of all segment texts:
+                # trailing whitespace is held back until more text follows it
+                chunk = pending + text
+                trimmed = chunk.rstrip()
+                body = trimmed if text_chars else trimmed.lstrip()
+                if body:
+                    transcript_file.write(body)
+                    text_chars += len(body)
+                    pending = chunk[len(trimmed):]
+                elif text_chars:
+                    pending = chunk
                 
-                f.write(f"{i}\n")
-                f.write(f"{start_time} --> {end_time}\n")
-                f.write(f"{text}\n\n")
+                srt_file.write(f"{segment_count}\n{format_srt_time(start)} --> {format_srt_time(end)}\n{text.strip()}\n\n")
         
-        print(f"Transcription complete. Text: {len(result['text'])} chars, Segments: {len(result['segments'])}")
-        return transcript_path, srt_path
+        print(f"Transcription complete. Text: {text_chars} chars, Segments: {segment_count}")
+        return transcript_path, srt_path, duration
         
     except Exception as e:
         raise Exception(f"Failed to transcribe audio: {str(e)}")
 
 def format_srt_time(seconds: float) -> str:
     """Convert seconds to SRT time format (HH:MM:SS,mmm)"""
-    td = timedelta(seconds=seconds)
-    hours, remainder = divmod(td.total_seconds(), 3600)
-    minutes, seconds = divmod(remainder, 60)
-    milliseconds = int((seconds % 1) * 1000)
-    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d},{milliseconds:03d}"
+    # Integer milliseconds, rounded so e.g. 2.3 (2.2999...) is not cut to ,299
+    milliseconds = int(seconds * 1000 + 0.5)
+    hours, milliseconds = divmod(milliseconds, 3_600_000)
+    minutes, milliseconds = divmod(milliseconds, 60_000)
+    secs, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{milliseconds:03d}"
 
 # ===== NEW FUNCTIONS FROM UPGRADE FILES =====
 
+def dumps_json_compact(data) -> str:
+    """Compact JSON string (no whitespace, non-ASCII kept), using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data).decode('utf-8')
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+def loads_json(text):
+    """Parse JSON text, using orjson when available (raises ValueError on bad input)."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+_JSON_DECODER = json.JSONDecoder()
+
+def decode_embedded_json(text, opener='['):
+    """
+    Decode the first JSON value starting at `opener` in an LLM response.
+    Surrounding text such as ```json fences is skipped without slicing the
+    response; raises ValueError if no value is found or it is truncated.
+    """
+    start = text.find(opener)
+    if start == -1:
+        raise ValueError(f"No JSON value starting with '{opener}' in response")
+    
+    if ORJSON_AVAILABLE:
+        # Common case: the value runs up to the last matching closer
+        end = text.rfind(']' if opener == '[' else '}')
+        if end > start:
+            try:
+                return orjson.loads(text[start:end + 1])
+            except orjson.JSONDecodeError:
+                pass
+    
+    value, _ = _JSON_DECODER.raw_decode(text, start)
+    return value
+
+def extract_json_object_text(text):
+    """
+    Return the first brace-balanced JSON object in an LLM response, ignoring
+    braces inside strings. A truncated object is returned from its '{'
+    onwards, and text without one is returned as is.
+    """
+    detector = JsonObjectEndDetector()
+    if detector.feed(text):
+        return text[detector.start:detector.end]
+    if detector.started:
+        return text[detector.start:]
+    return text
+
+def write_json_file(data, json_path: Path, indent=True):
+    """Serialize data to a UTF-8 JSON file, using orjson when available.
+    
+    The data is written to a temporary sibling file and moved into place with
+    os.replace, so an interrupted run never leaves a truncated JSON behind.
+    """
+    json_path = Path(json_path)
+    tmp_path = json_path.with_suffix(json_path.suffix + '.tmp')
+    try:
+        if ORJSON_AVAILABLE:
+            # NON_STR_KEYS mirrors json.dump, which stringifies int keys
+            option = orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            tmp_path.write_bytes(orjson.dumps(data, option=option))
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                if indent:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                else:
+                    json.dump(data, f, separators=(',', ':'), ensure_ascii=False)
+        os.replace(tmp_path, json_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+# Timing line of an SRT cue ("00:00:01,000 --> 00:00:04,500")
+_SRT_TIMING_RE = re.compile(r'([\d:,]+) --> ([\d:,]+)')
+
+def _iter_srt_cues(lines):
+    """
+    Yield (index, start, end, text_lines) per cue in one linear pass over SRT lines.
+    A cue's text runs until a blank line followed by the next numeric index line.
+    """
+    index = None       # index line waiting for its timing line
+    cue = None         # (index, start, end, text_lines) of the cue being read
+    for line in lines:
+        terminated = line.endswith('\n')
+        line = line.rstrip('\n')
+        
+        if cue is not None:
+            text_lines = cue[3]
+            if not (terminated and line.isdecimal() and text_lines and text_lines[-1] == ''):
+                text_lines.append(line)
+                continue
+            # Blank line + complete index line: the current cue is complete
+            yield cue
+            cue = None
+        
+        if index is not None:
+            timing = _SRT_TIMING_RE.fullmatch(line)
+            index_line, index = index, None
+            if timing:
+                cue = (index_line, timing.group(1), timing.group(2), [])
+                continue
+        
+        if line.isdecimal():
+            index = int(line)
+    
+    if cue is not None:
+        yield cue
+
 def srt_to_json(srt_path: Path, json_path: Path):
     """Convert SRT file to JSON format - exact logic from srt_to_json.py"""
+    # Stream the file line by line instead of regex-scanning it as one string
     with open(srt_path, 'r', encoding='utf-8') as f:
-        srt_content = f.read()
-
-    cues = []
-    for match in re.finditer(r'(\d+)\n([\d:,]+) --> ([\d:,]+)\n(.*?)(?=\n\n\d+\n|$)', srt_content, re.DOTALL):
-        index = int(match.group(1))
-        start = match.group(2).replace(',', '.')
-        end = match.group(3).replace(',', '.')
-        text = match.group(4).strip().replace('\n', ' ')
-
-        cues.append({
-            "index": index,
-            "start": start,
-            "end": end,
-            "speaker": "",
-            "text": text
-        })
+        cues = [
+            {
+                "index": index,
+                "start": start.replace(',', '.'),
+                "end": end.replace(',', '.'),
+                "speaker": "",
+                "text": '\n'.join(text_lines).strip().replace('\n', ' ')
+            }
+            for index, start, end, text_lines in _iter_srt_cues(f)
+        ]
 
-    with open(json_path, 'w', encoding='utf-8') as f:
-        json.dump(cues, f, indent=2, ensure_ascii=False)
+    # Intermediate file, so no indentation
+    write_json_file(cues, json_path, indent=False)
     
     print(f'Successfully converted {srt_path} to {json_path}')
     return cues
 
+@functools.lru_cache(maxsize=None)
+def _get_token_encoder():
+    """Load the local BPE encoder once (None if tiktoken is unavailable)."""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
 def estimate_tokens(text):
-    """Rough estimation of tokens based on character count."""
+    """Count tokens with a local tokenizer, falling back to ~3 chars per token."""
+    encoder = _get_token_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
     return len(text) // 3  # Rough approximation: ~3 chars per token
 
+# Upper bound on characters per token, so at most this much text is encoded
+MAX_CHARS_PER_TOKEN = 8
+
+def truncate_to_tokens(text, max_tokens):
+    """
+    Cut text to at most max_tokens tokens with the local tokenizer. Without
+    tiktoken, falls back to ~4 chars per token (typical for English text).
+    """
+    encoder = _get_token_encoder()
+    if encoder is None:
+        return text[:max_tokens * 4]
+    
+    # Pre-cut to bound the encoding work; real text averages far fewer chars per token
+    text = text[:max_tokens * MAX_CHARS_PER_TOKEN]
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens])
+
 def extract_speaker_info_from_txt(transcript_text):
     """Extract speaker information from the full transcript text using Gemini API."""
     print("\nStep 1: Extracting speaker information from transcript.txt...")
@@ -1878,11 +2726,11 @@ def extract_speaker_info_from_txt(transcript_text):
         return {"speakers": []}
     
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name=MODEL_NAME)
+        model = _get_gemini_model(api_key)
         
         prompt = GEMINI_PROMPT_FOR_CONTEXT + transcript_text + "\n\nReturn ONLY the JSON object, no other text."
         
+        _GEMINI_RATE_LIMITER.acquire()
         response = model.generate_content(prompt)
         cleaned_response = response.text.strip()
         
@@ -1892,7 +2740,7 @@ def extract_speaker_info_from_txt(transcript_text):
         if cleaned_response.endswith("```"):
             cleaned_response = cleaned_response[:-3]
         
-        speaker_info = json.loads(cleaned_response.strip())
+        speaker_info = loads_json(cleaned_response.strip())
         
         print(f"Successfully extracted information for {len(speaker_info.get('speakers', []))} speakers:")
         for speaker in speaker_info.get('speakers', []):
@@ -1919,8 +2767,7 @@ def create_global_speaker_context(speaker_info, compact=False):
         return create_compact_speaker_context(speaker_lookup)
     else:
         # Original format (for backward compatibility)
-        context = "\n\nKNOWN SPEAKERS IN THIS TRANSCRIPT:\n"
-        context += "=" * 50 + "\n"
+        parts = ["\n\nKNOWN SPEAKERS IN THIS TRANSCRIPT:\n", "=" * 50 + "\n"]
         
         for speaker in speaker_info.get('speakers', []):
             name = speaker.get('name', 'Unknown')
@@ -1929,63 +2776,140 @@ def create_global_speaker_context(speaker_info, compact=False):
             country = speaker.get('country', '')
             desc = speaker.get('description', '')
             
-            context += f"• {name}"
+            parts.append(f"• {name}")
             if title:
-                context += f" - {title}"
+                parts.append(f" - {title}")
             if org:
-                context += f" at {org}"
+                parts.append(f" at {org}")
             if country:
-                context += f" (representing {country})"
+                parts.append(f" (representing {country})")
             if desc:
-                context += f"\n  Description: {desc}"
-            context += "\n"
+                parts.append(f"\n  Description: {desc}")
+            parts.append("\n")
         
-        context += "=" * 50 + "\n"
-        context += "IMPORTANT: Use these EXACT speaker names when you recognize them in the transcript segments.\n"
-        context += "For speakers not in this list, use descriptive labels like 'Participant 1', 'Moderator', etc.\n\n"
+        parts.append("=" * 50 + "\n")
+        parts.append("IMPORTANT: Use these EXACT speaker names when you recognize them in the transcript segments.\n")
+        parts.append("For speakers not in this list, use descriptive labels like 'Participant 1', 'Moderator', etc.\n\n")
         
-        return context
+        return ''.join(parts)
 
-def create_batches(transcript_data, max_segments_per_batch):
-    """Split transcript data into manageable batches."""
+def create_batches(transcript_data, max_segments_per_batch=None, max_tokens_per_batch=int(MAX_TOKENS_PER_BATCH * 0.9)):
+    """
+    Split transcript data into manageable batches.
+    Segments are packed greedily until the measured token budget is reached;
+    max_segments_per_batch optionally caps the segment count as well.
+    """
     batches = []
-    for i in range(0, len(transcript_data), max_segments_per_batch):
-        batch = transcript_data[i:i + max_segments_per_batch]
+    batch = []
+    batch_tokens = 2  # Enclosing brackets of the JSON array
+    
+    for segment in transcript_data:
+        segment_tokens = estimate_tokens(dumps_json_compact(segment)) + 1
+        batch_full = batch_tokens + segment_tokens > max_tokens_per_batch
+        if max_segments_per_batch and len(batch) >= max_segments_per_batch:
+            batch_full = True
+        if batch and batch_full:
+            batches.append(batch)
+            batch = []
+            batch_tokens = 2
+        batch.append(segment)
+        batch_tokens += segment_tokens
+    
+    if batch:
         batches.append(batch)
     
-    print(f"Split transcript into {len(batches)} batches of maximum {max_segments_per_batch} segments each.")
+    print(f"Split transcript into {len(batches)} batches of maximum {max_tokens_per_batch} tokens each.")
     return batches
 
-def create_speaker_context(all_filled_segments):
-    """Create a context summary of identified speakers from previous batches."""
-    speaker_examples = {}
+def collect_speaker_examples(segments, speaker_examples=None):
+    """
+    Add up to 2 speech examples per speaker from segments to speaker_examples
+    (a new dict if not given), so callers can update it batch by batch.
+    """
+    if speaker_examples is None:
+        speaker_examples = {}
     
     # Collect examples of each speaker's speech
-    for segment in all_filled_segments:
+    for segment in segments:
         if segment.get("speaker") and segment["speaker"] != "":
-            speaker_name = segment["speaker"]
-            if speaker_name not in speaker_examples:
-                speaker_examples[speaker_name] = []
+            # Interned so repeated labels share one string object
+            speaker_name = sys.intern(segment["speaker"])
+            examples = speaker_examples.setdefault(speaker_name, [])
             
             # Store up to 2 examples per speaker
             # Use .get() to handle cases where small models return incomplete segments
-            if len(speaker_examples[speaker_name]) < 2 and segment.get("text"):
-                speaker_examples[speaker_name].append(segment["text"][:200])  # First 200 chars
+            if len(examples) < 2 and segment.get("text"):
+                examples.append(segment["text"][:200])  # First 200 chars
     
+    return speaker_examples
+
+def format_speaker_context(speaker_examples):
+    """Render collected speaker examples as the previous-batches prompt context."""
     if not speaker_examples:
         return ""
     
-    context = "\n\nPreviously identified speakers in earlier batches:\n"
+    lines = ["\n\nPreviously identified speakers in earlier batches:\n"]
     for speaker, examples in speaker_examples.items():
-        context += f"- {speaker}: {' | '.join(examples)}\n"
+        lines.append(f"- {speaker}: {' | '.join(examples)}\n")
+    
+    return ''.join(lines)
+
+def create_speaker_context(all_filled_segments):
+    """Create a context summary of identified speakers from previous batches."""
+    return format_speaker_context(collect_speaker_examples(all_filled_segments))
+
+class RequestRateLimiter:
+    """Thread-safe pacing of API requests to a requests-per-minute budget."""
+    
+    def __init__(self, requests_per_minute):
+        self.interval = 60.0 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
     
-    return context
+    def acquire(self):
+        """Block until the caller's request slot comes up."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+# Shared by every Gemini call, so parallel batches pace themselves instead of
+# colliding into 429 storms
+_GEMINI_RATE_LIMITER = RequestRateLimiter(GEMINI_REQUESTS_PER_MINUTE)
+
+_RETRY_AFTER_RE = re.compile(r'retry[_ ](?:delay|after)\D{0,20}(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+def gemini_retry_delay(error, attempt):
+    """
+    Return seconds to wait before retrying a failed Gemini call, or None when
+    retrying cannot help (client errors such as invalid arguments or bad keys).
+    """
+    # google.api_core exceptions carry the HTTP status as .code
+    status = getattr(error, 'code', None)
+    error_msg = str(error)
+    backoff = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
+    
+    if status == 429 or '429' in error_msg or 'quota' in error_msg.lower():
+        # Rate limited: wait exactly as long as the server asks, if it says
+        retry_after = _RETRY_AFTER_RE.search(error_msg)
+        if retry_after:
+            return min(float(retry_after.group(1)), MAX_DELAY)
+        return backoff
+    
+    if isinstance(status, int) and 400 <= status < 500 and status != 408:
+        return None
+    
+    # 5xx, timeouts and connection errors: exponential backoff with jitter
+    return backoff
 
 def call_gemini_with_retry(model, prompt, batch_number, total_batches):
-    """Call Gemini API with retry logic and exponential backoff."""
+    """Call Gemini API with rate limiting and status-aware retries."""
     for attempt in range(MAX_RETRIES):
         try:
             print(f"  Attempt {attempt + 1}/{MAX_RETRIES} for batch {batch_number}/{total_batches}...")
+            _GEMINI_RATE_LIMITER.acquire()
             response = model.generate_content(prompt)
             return response
         
@@ -1998,8 +2922,10 @@ def call_gemini_with_retry(model, prompt, batch_number, total_batches):
                 print(f"  All {MAX_RETRIES} attempts failed for batch {batch_number}")
                 return None
             
-            # Calculate delay with exponential backoff and jitter
-            delay = min(BASE_DELAY * (2 ** attempt) + random.uniform(0, 1), MAX_DELAY)
+            delay = gemini_retry_delay(e, attempt)
+            if delay is None:
+                print(f"  Not retrying batch {batch_number}: request was rejected")
+                return None
             print(f"  Waiting {delay:.1f} seconds before retry...")
             time.sleep(delay)
     
@@ -2009,14 +2935,15 @@ def fill_speakers_in_batch(batch_data, batch_number, total_batches, global_speak
     """Uses the Gemini API to fill in the speaker fields for a batch of transcript segments."""
     print(f"\nStep 2: Processing batch {batch_number}/{total_batches} ({len(batch_data)} segments)...")
 
-    batch_string = json.dumps(batch_data, separators=(',', ':'), ensure_ascii=False)
+    # Serialized once and reused for both the token estimate and the prompt
+    batch_string = dumps_json_compact(batch_data)
     
     # Estimate tokens for this batch
     estimated_tokens = estimate_tokens(batch_string)
     print(f"Estimated tokens for this batch: {estimated_tokens}")
     
     if estimated_tokens > MAX_TOKENS_PER_BATCH:
-        print(f"WARNING: Batch may exceed token limit. Consider reducing MAX_SEGMENTS_PER_BATCH.")
+        print(f"WARNING: Batch may exceed token limit. Consider reducing MAX_TOKENS_PER_BATCH.")
 
     # Get API key
     api_key = None
@@ -2035,15 +2962,16 @@ def fill_speakers_in_batch(batch_data, batch_number, total_batches, global_speak
         return batch_data
 
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel(model_name=MODEL_NAME)
+        model = _get_gemini_model(api_key)
     except Exception as e:
         print(f"Error setting up Gemini model: {e}")
         return batch_data
 
+    # Everything that is identical across batches comes first, so Gemini's
+    # implicit prefix caching can reuse it; per-batch parts follow at the end
     prompt = f"""
 You are an expert in transcript analysis and speaker diarization.
-Your task is to analyze the following JSON transcript batch (part {batch_number} of {total_batches}). 
+Your task is to analyze the JSON transcript batch given at the end of this prompt. 
 This transcript contains segments of speech, each with an empty "speaker" field.
 
 Based on the content of the "text" field in each segment, identify who is speaking. 
@@ -2051,8 +2979,6 @@ Use the speaker information and context provided below to maintain accurate and
 
 {global_speaker_context}
 
-{previous_speaker_context}
-
 INSTRUCTIONS:
 1. Use the EXACT speaker names from the "KNOWN SPEAKERS" list when you recognize them
 3. Maintain consistency with speakers identified in previous batches
@@ -2061,7 +2987,9 @@ INSTRUCTIONS:
 Please return the **complete and valid JSON object**, identical in structure to the input, 
 but with the "speaker" field correctly filled for every segment.
 
-Input Transcript Batch:
+{previous_speaker_context}
+
+Input Transcript Batch (part {batch_number} of {total_batches}):
 ```json
 {batch_string}
 ```
@@ -2069,82 +2997,251 @@ Input Transcript Batch:
 Your output should be ONLY the filled JSON, starting with `[` and ending with `]`.
 """
 
-    # Call Gemini with retry logic
-    response = call_gemini_with_retry(model, prompt, batch_number, total_batches)
-    
-    if response is None:
-        print(f"\nFailed to get response from Gemini API after {MAX_RETRIES} attempts for batch {batch_number}")
-        return batch_data
-
-    try:
-        # Clean up the response to ensure it's valid JSON
-        cleaned_response = response.text.strip()
-        if cleaned_response.startswith("```json"):
-            cleaned_response = cleaned_response[7:]
-        if cleaned_response.endswith("```"):
-            cleaned_response = cleaned_response[:-3]
-
-        # Check if JSON response appears to be truncated
-        cleaned_response = cleaned_response.strip()
-        if not cleaned_response.endswith(']') and not cleaned_response.endswith('}'):
-            print(f"Warning: Response appears to be truncated for batch {batch_number}")
-            print(f"Response ends with: '{cleaned_response[-50:]}'")
-            raise ValueError("Response appears to be truncated - incomplete JSON")
-
-        filled_data = json.loads(cleaned_response)
+    # Malformed responses are re-asked immediately; transport errors are
+    # retried (with backoff) inside call_gemini_with_retry
+    for parse_attempt in range(MAX_PARSE_RETRIES + 1):
+        # Call Gemini with retry logic
+        response = call_gemini_with_retry(model, prompt, batch_number, total_batches)
         
-        # Validate that we got the expected number of segments
-        if len(filled_data) != len(batch_data):
-            print(f"Warning: Expected {len(batch_data)} segments, got {len(filled_data)} for batch {batch_number}")
-            raise ValueError(f"Segment count mismatch: expected {len(batch_data)}, got {len(filled_data)}")
+        if response is None:
+            print(f"\nFailed to get response from Gemini API after {MAX_RETRIES} attempts for batch {batch_number}")
+            return batch_data
         
-        print(f"Successfully processed batch {batch_number}/{total_batches}")
-        return filled_data
-    except Exception as e:
-        print(f"\nAn error occurred while parsing response for batch {batch_number}: {e}")
-        print("--- API Response Text ---")
         try:
-            response_preview = response.text[:2000] + "..." if len(response.text) > 2000 else response.text
-            print(response_preview)
-            print(f"\nResponse length: {len(response.text)} characters")
-            print(f"Response ends with: '{response.text[-100:]}'")
-        except:
-            print("Could not display response text")
-        print("------------------------")
-        return batch_data
+            # Decode the array in place, past any ```json fence around it
+            try:
+                filled_data = decode_embedded_json(response.text, '[')
+            except ValueError:
+                # Check if JSON response appears to be truncated
+                print(f"Warning: Response appears to be truncated for batch {batch_number}")
+                print(f"Response ends with: '{response.text.rstrip()[-50:]}'")
+                raise ValueError("Response appears to be truncated - incomplete JSON")
+            
+            # Validate that we got the expected number of segments
+            if len(filled_data) != len(batch_data):
+                print(f"Warning: Expected {len(batch_data)} segments, got {len(filled_data)} for batch {batch_number}")
+                raise ValueError(f"Segment count mismatch: expected {len(batch_data)}, got {len(filled_data)}")
+            
+            print(f"Successfully processed batch {batch_number}/{total_batches}")
+            return filled_data
+        except Exception as e:
+            print(f"\nAn error occurred while parsing response for batch {batch_number}: {e}")
+            print("--- API Response Text ---")
+            try:
+                response_preview = response.text[:2000] + "..." if len(response.text) > 2000 else response.text
+                print(response_preview)
+                print(f"\nResponse length: {len(response.text)} characters")
+                print(f"Response ends with: '{response.text[-100:]}'")
+            except:
+                print("Could not display response text")
+            print("------------------------")
+            
+            if parse_attempt < MAX_PARSE_RETRIES:
+                print(f"Re-requesting batch {batch_number} ({parse_attempt + 1}/{MAX_PARSE_RETRIES})...")
+    
+    return batch_data
 
 def fill_speakers_in_json(transcript_data, global_speaker_context):
     """Uses the Gemini API to fill in the speaker fields in a transcript JSON using batching."""
     print(f"\nStep 2: Processing transcript with {len(transcript_data)} segments...")
     
     # Create batches
-    batches = create_batches(transcript_data, MAX_SEGMENTS_PER_BATCH)
-    
-    all_filled_segments = []
+    batches = create_batches(transcript_data)
+    
+    # Every batch owns a fixed slice of the output list, so filled segments are
+    # assigned in place instead of growing the list batch by batch
+    batch_starts = [0, *accumulate(len(batch) for batch in batches)]
+    all_filled_segments = [None] * batch_starts[-1]
+    
+    if MAX_CONCURRENT_BATCHES > 1 and len(batches) > 1:
+        # Batches are independent round trips, so several run at once; the known
+        # speakers in the global context keep labels consistent across them
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_BATCHES) as executor:
+            futures = [
+                executor.submit(fill_speakers_in_batch, batch, i, len(batches), global_speaker_context)
+                for i, batch in enumerate(batches, 1)
+            ]
+            # Results are stitched back together in batch order
+            filled_batches = [future.result() for future in futures]
+    else:
+        filled_batches = None
+        speaker_examples = {}
     
     for i, batch in enumerate(batches, 1):
-        # Create speaker context from previously processed segments
-        previous_speaker_context = create_speaker_context(all_filled_segments)
-        
-        # Process the batch with both global and previous context
-        filled_batch = fill_speakers_in_batch(
-            batch, i, len(batches), 
-            global_speaker_context, 
-            previous_speaker_context
-        )
+        start = batch_starts[i - 1]
+        if filled_batches is not None:
+            filled_batch = filled_batches[i - 1]
+        else:
+            # Create speaker context from previously processed segments
+            previous_speaker_context = format_speaker_context(speaker_examples)
+            
+            # Process the batch with both global and previous context
+            filled_batch = fill_speakers_in_batch(
+                batch, i, len(batches), 
+                global_speaker_context, 
+                previous_speaker_context
+            )
         
         if filled_batch is None:
             print(f"Failed to process batch {i}. Using original data.")
             filled_batch = batch
         
-        # Add to our collection of filled segments
-        all_filled_segments.extend(filled_batch)
+        # Place the batch in its slice of the filled segments
+        all_filled_segments[start:start + len(batch)] = filled_batch
+        if filled_batches is None:
+            # Only the new batch is scanned for the next batch's context
+            collect_speaker_examples(filled_batch, speaker_examples)
     
     print(f"\nSuccessfully processed all {len(batches)} batches.")
     print(f"Total segments processed: {len(all_filled_segments)}")
     
     return all_filled_segments
 
+# Speaker parsing keyword tables (organize_speakers_table.py)
+COUNTRY_INDICATORS = [
+    'Afghanistan', 'Albania', 'Algeria', 'Argentina', 'Australia', 'Austria', 'Bangladesh', 
+    'Belgium', 'Brazil', 'Canada', 'China', 'Colombia', 'Denmark', 'Egypt', 'France', 
+    'Germany', 'India', 'Indonesia', 'Iran', 'Iraq', 'Italy', 'Japan', 'Jordan', 
+    'Kenya', 'Malaysia', 'Mexico', 'Morocco', 'Netherlands', 'Nigeria', 'Norway', 
+    'Pakistan', 'Philippines', 'Poland', 'Russia', 'Saudi Arabia', 'South Africa', 
+    'Spain', 'Sweden', 'Switzerland', 'Turkey', 'Ukraine', 'United Kingdom', 'UK', 
+    'United States', 'USA', 'Venezuela', 'Vietnam', 'Yemen', 'Zimbabwe',
+    'Dominican Republic', 'East African'
+]
+
+ORG_INDICATORS = [
+    'UN', 'United Nations', 'UNESCO', 'UNICEF', 'WHO', 'IMF', 'World Bank',
+    'European Union', 'EU', 'African Union', 'AU', 'ASEAN', 'NATO', 'OSCE',
+    'Ministry', 'Department', 'Office', 'Committee', 'Council', 'Commission',
+    'Organization', 'Organisation', 'Government', 'Embassy', 'Delegation',
+    'Secretariat', 'Agency', 'Bureau', 'Institute', 'Foundation', 'Society',
+    'Association', 'Federation', 'Union', 'Alliance', 'Coalition',
+    'ADB', 'Asian Development Bank', 'Drupal', 'Project Liberty'
+]
+
+TITLE_INDICATORS = [
+    'Secretary-General', 'Secretary General', 'Undersecretary', 'Under-Secretary',
+    'Assistant Secretary', 'Special Representative', 'Special Envoy', 'Special Advisor',
+    'Ambassador', 'Permanent Representative', 'Minister', 'Deputy Minister',
+    'Director-General', 'Director General', 'Executive Director', 'President',
+    'Vice President', 'Chairman', 'Chair', 'Moderator', 'Commissioner',
+    'Representative', 'Delegate', 'Coordinator', 'Adviser', 'Advisor', 'CEO',
+    'Expert', 'Analyst', 'Consultant', 'Researcher'
+]
+
+def _lowered_longest_first(indicators):
+    """Return (lowercase, original) pairs ordered so longer keywords match first."""
+    return tuple(sorted(((item.lower(), item) for item in indicators), key=lambda pair: -len(pair[0])))
+
+_COUNTRY_LC = _lowered_longest_first(COUNTRY_INDICATORS)
+_ORG_LC = _lowered_longest_first(ORG_INDICATORS)
+_TITLE_LC = _lowered_longest_first(TITLE_INDICATORS)
+_ORG_AND_COUNTRY_LC = tuple(lc for lc, _ in _ORG_LC + _COUNTRY_LC)
+
+# Indicator kinds, in the order of the tuples returned by _indicator_ranks
+_TITLE_KIND, _COUNTRY_KIND, _ORG_KIND = 0, 1, 2
+
+def _build_indicator_automaton():
+    """Build one automaton over all indicator keywords (None without pyahocorasick)."""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    
+    # A keyword can appear in several tables, so each maps to all its (kind, rank) entries
+    entries = {}
+    for kind, table in enumerate((_TITLE_LC, _COUNTRY_LC, _ORG_LC)):
+        for rank, (keyword, _) in enumerate(table):
+            entries.setdefault(keyword, []).append((kind, rank))
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, keyword_entries in entries.items():
+        automaton.add_word(keyword, tuple(keyword_entries))
+    automaton.make_automaton()
+    return automaton
+
+_INDICATOR_AUTOMATON = _build_indicator_automaton()
+
+def _indicator_ranks(lowered):
+    """
+    Return sorted (title, country, org) indicator ranks found in a lowercased label.
+    Ranks index _TITLE_LC / _COUNTRY_LC / _ORG_LC, so the first rank is the
+    keyword an ordered substring scan would have found first.
+    """
+    if _INDICATOR_AUTOMATON is None:
+        return tuple(
+            [rank for rank, (keyword, _) in enumerate(table) if keyword in lowered]
+            for table in (_TITLE_LC, _COUNTRY_LC, _ORG_LC)
+        )
+    
+    found = (set(), set(), set())
+    for _, keyword_entries in _INDICATOR_AUTOMATON.iter(lowered):
+        for kind, rank in keyword_entries:
+            found[kind].add(rank)
+    return tuple(sorted(ranks) for ranks in found)
+
+def _has_org_or_country(lowered):
+    """Check a lowercased string for any organization or country indicator."""
+    if _INDICATOR_AUTOMATON is None:
+        return any(indicator in lowered for indicator in _ORG_AND_COUNTRY_LC)
+    
+    for _, keyword_entries in _INDICATOR_AUTOMATON.iter(lowered):
+        for kind, _ in keyword_entries:
+            if kind != _TITLE_KIND:
+                return True
+    return False
+
+# Substrings marking a country label as government (Pattern 6) and a label as a
+# bare organization name (Pattern 10); kept as substrings, not tokens, so e.g.
+# "Ministerial Delegate" still counts as government context
+_GOVERNMENT_CONTEXT_WORDS = ('minister', 'government', 'representative', 'ambassador')
+_ORG_ONLY_RE = re.compile(r'ministry|department|office|un ')  # searched on the lowercased label
+
+# Speaker label patterns, compiled once at import
+_PAREN_RE = re.compile(r'^(.+?)\s*\((.+?)\)$')
+_DASH_RE = re.compile(r'^(.+?)\s*[–-]\s*(.+)$')
+_COLON_RE = re.compile(r'^(.+?):\s*(.+)$')
+_OF_RE = re.compile(r'^(.+?)\s+of\s+(.+)$', re.IGNORECASE)
+
+# Pattern 8 roles and what they represent, in priority order
+_SPECIAL_ROLES = (
+    ('moderator', 'Event Moderator'),
+    ('chair', 'Session Chair'),
+    ('chairperson', 'Session Chair'),
+    ('host', 'Event Host'),
+    ('facilitator', 'Session Facilitator'),
+)
+# One lookahead per role, tried in order at the start of the lowercased label,
+# so the first role (not the leftmost occurrence) wins; lastindex names it
+_SPECIAL_ROLE_RE = re.compile(
+    '|'.join(f'(?=.*?({re.escape(role)}))' for role, _ in _SPECIAL_ROLES),
+    re.DOTALL
+)
+
+def _split_on_of(speaker_name, lowered):
+    """Split "Name of Organization" at the first " of " (any case); None if absent."""
+    if not speaker_name.isprintable() or len(lowered) != len(speaker_name):
+        # Tabs, newlines or NBSP may surround "of" (printable text has no
+        # whitespace but the plain space), or lower() changed the length
+        # (e.g. "İ") so offsets don't carry over: use the regex
+        of_match = _OF_RE.match(speaker_name)
+        return of_match.groups() if of_match else None
+    of_index = lowered.find(' of ', 1)
+    if of_index == -1:
+        return None
+    return speaker_name[:of_index], speaker_name[of_index + 4:]
+
+# Per-title extraction patterns, in the same longest-first order as _TITLE_LC
+_TITLE_PATTERNS = tuple(
+    (title_lc, tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+        rf'{re.escape(title)}\s+(?:of|for|from)\s+(.+?)(?:\s|$)',
+        rf'(.+?)\s+{re.escape(title)}',  # "Country Minister"
+        rf'{re.escape(title)}.*?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'  # Extract proper nouns after title
+    )))
+    for title_lc, title in _TITLE_LC
+)
+
+# Meetings repeat the same handful of speaker labels across many turns, so
+# parsing is memoized per unique label (results are immutable tuples)
+@functools.lru_cache(maxsize=512)
 def parse_speaker_info(speaker_name):
     """Advanced parser to extract speaker name and representing organization/country - exact logic from organize_speakers_table.py"""
     if not speaker_name or speaker_name.strip() == "":
@@ -2153,49 +3250,17 @@ def parse_speaker_info(speaker_name):
     speaker_name = speaker_name.strip()
     original_name = speaker_name
     
-    import re
-    
-    # Define comprehensive patterns and keywords
-    country_indicators = [
-        'Afghanistan', 'Albania', 'Algeria', 'Argentina', 'Australia', 'Austria', 'Bangladesh', 
-        'Belgium', 'Brazil', 'Canada', 'China', 'Colombia', 'Denmark', 'Egypt', 'France', 
-        'Germany', 'India', 'Indonesia', 'Iran', 'Iraq', 'Italy', 'Japan', 'Jordan', 
-        'Kenya', 'Malaysia', 'Mexico', 'Morocco', 'Netherlands', 'Nigeria', 'Norway', 
-        'Pakistan', 'Philippines', 'Poland', 'Russia', 'Saudi Arabia', 'South Africa', 
-        'Spain', 'Sweden', 'Switzerland', 'Turkey', 'Ukraine', 'United Kingdom', 'UK', 
-        'United States', 'USA', 'Venezuela', 'Vietnam', 'Yemen', 'Zimbabwe',
-        'Dominican Republic', 'East African'
-    ]
-    
-    org_indicators = [
-        'UN', 'United Nations', 'UNESCO', 'UNICEF', 'WHO', 'IMF', 'World Bank',
-        'European Union', 'EU', 'African Union', 'AU', 'ASEAN', 'NATO', 'OSCE',
-        'Ministry', 'Department', 'Office', 'Committee', 'Council', 'Commission',
-        'Organization', 'Organisation', 'Government', 'Embassy', 'Delegation',
-        'Secretariat', 'Agency', 'Bureau', 'Institute', 'Foundation', 'Society',
-        'Association', 'Federation', 'Union', 'Alliance', 'Coalition',
-        'ADB', 'Asian Development Bank', 'Drupal', 'Project Liberty'
-    ]
-    
-    title_indicators = [
-        'Secretary-General', 'Secretary General', 'Undersecretary', 'Under-Secretary',
-        'Assistant Secretary', 'Special Representative', 'Special Envoy', 'Special Advisor',
-        'Ambassador', 'Permanent Representative', 'Minister', 'Deputy Minister',
-        'Director-General', 'Director General', 'Executive Director', 'President',
-        'Vice President', 'Chairman', 'Chair', 'Moderator', 'Commissioner',
-        'Representative', 'Delegate', 'Coordinator', 'Adviser', 'Advisor', 'CEO',
-        'Expert', 'Analyst', 'Consultant', 'Researcher'
-    ]
+    lowered = speaker_name.lower()
     
     # Pattern 1: "Name (Organization/Country)"
-    paren_match = re.match(r'^(.+?)\s*\((.+?)\)$', speaker_name)
+    paren_match = _PAREN_RE.match(speaker_name)
     if paren_match:
         name_part = paren_match.group(1).strip()
         org_part = paren_match.group(2).strip()
         return name_part, org_part
     
     # Pattern 2: "Name - Organization" or "Name – Organization"
-    dash_match = re.match(r'^(.+?)\s*[–-]\s*(.+)$', speaker_name)
+    dash_match = _DASH_RE.match(speaker_name)
     if dash_match:
         name_part = dash_match.group(1).strip()
         org_part = dash_match.group(2).strip()
@@ -2207,200 +3272,198 @@ def parse_speaker_info(speaker_name):
         name_part = comma_parts[0].strip()
         remaining = ', '.join(comma_parts[1:]).strip()
         # Check if remaining parts contain organization indicators
-        if any(indicator.lower() in remaining.lower() for indicator in org_indicators + country_indicators):
+        if _has_org_or_country(remaining.lower()):
             return name_part, remaining
     
     # Pattern 4: "Organization: Name" or "Country: Name"
-    colon_match = re.match(r'^(.+?):\s*(.+)$', speaker_name)
+    colon_match = _COLON_RE.match(speaker_name)
     if colon_match:
         first_part = colon_match.group(1).strip()
         second_part = colon_match.group(2).strip()
         # Usually organization comes first in this pattern
         return second_part, first_part
     
+    # All title/country/organization keywords in the label, found in one pass
+    title_ranks, country_ranks, org_ranks = _indicator_ranks(lowered)
+    
     # Pattern 5: Check for titles that indicate representing organization
-    for title in title_indicators:
-        if title.lower() in speaker_name.lower():
-            # Look for "of", "for", "from" patterns
-            title_patterns = [
-                rf'{re.escape(title)}\s+(?:of|for|from)\s+(.+?)(?:\s|$)',
-                rf'(.+?)\s+{re.escape(title)}',  # "Country Minister"
-                rf'{re.escape(title)}.*?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)'  # Extract proper nouns after title
-            ]
-            
-            for pattern in title_patterns:
-                title_match = re.search(pattern, speaker_name, re.IGNORECASE)
-                if title_match:
-                    org_extract = title_match.group(1).strip()
-                    if len(org_extract) > 2:  # Avoid single letters
-                        # If it's a known country or organization
-                        if any(indicator.lower() in org_extract.lower() for indicator in country_indicators + org_indicators):
-                            return speaker_name, org_extract
+    for title_rank in title_ranks:
+        # Look for "of", "for", "from" patterns
+        for pattern in _TITLE_PATTERNS[title_rank][1]:
+            title_match = pattern.search(speaker_name)
+            if title_match:
+                org_extract = title_match.group(1).strip()
+                if len(org_extract) > 2:  # Avoid single letters
+                    # If it's a known country or organization
+                    if _has_org_or_country(org_extract.lower()):
+                        return speaker_name, org_extract
     
     # Pattern 6: Country names in speaker name
-    for country in country_indicators:
-        if country.lower() in speaker_name.lower():
-            # Check for government context
-            if any(word in speaker_name.lower() for word in ['minister', 'government', 'representative', 'ambassador']):
-                return speaker_name, f"{country} Government"
-            else:
-                return speaker_name, country
+    if country_ranks:
+        country = _COUNTRY_LC[country_ranks[0]][1]
+        # Check for government context
+        if any(word in lowered for word in _GOVERNMENT_CONTEXT_WORDS):
+            return speaker_name, f"{country} Government"
+        else:
+            return speaker_name, country
     
     # Pattern 7: Organization names in speaker name
-    for org in org_indicators:
-        if org.lower() in speaker_name.lower():
-            # Special handling for specific organizations
-            if "world bank" in speaker_name.lower():
-                return speaker_name, "World Bank"
-            elif "asian development bank" in speaker_name.lower() or "adb" in speaker_name.lower():
-                return speaker_name, "Asian Development Bank"
-            elif "drupal" in speaker_name.lower():
-                return speaker_name, "Drupal Foundation"
-            elif "project liberty" in speaker_name.lower():
-                return speaker_name, "Project Liberty Institute"
-            elif "east african" in speaker_name.lower():
-                return speaker_name, "East African Community"
-            elif "un" in speaker_name.lower() or "united nations" in speaker_name.lower():
-                # Try to be more specific about UN agency
-                if "office" in speaker_name.lower():
-                    return speaker_name, "UN Office"
-                elif "special" in speaker_name.lower():
-                    return speaker_name, "UN Special Office"
-                else:
-                    return speaker_name, "United Nations"
+    if org_ranks:
+        # Special handling for specific organizations
+        if "world bank" in lowered:
+            return speaker_name, "World Bank"
+        elif "asian development bank" in lowered or "adb" in lowered:
+            return speaker_name, "Asian Development Bank"
+        elif "drupal" in lowered:
+            return speaker_name, "Drupal Foundation"
+        elif "project liberty" in lowered:
+            return speaker_name, "Project Liberty Institute"
+        elif "east african" in lowered:
+            return speaker_name, "East African Community"
+        elif "un" in lowered or "united nations" in lowered:
+            # Try to be more specific about UN agency
+            if "office" in lowered:
+                return speaker_name, "UN Office"
+            elif "special" in lowered:
+                return speaker_name, "UN Special Office"
             else:
-                return speaker_name, org
+                return speaker_name, "United Nations"
+        else:
+            return speaker_name, _ORG_LC[org_ranks[0]][1]
     
     # Pattern 8: Special cases for common roles
-    special_cases = {
-        'moderator': 'Event Moderator',
-        'chair': 'Session Chair', 
-        'chairperson': 'Session Chair',
-        'host': 'Event Host',
-        'facilitator': 'Session Facilitator'
-    }
-    
-    for role, representing in special_cases.items():
-        if role.lower() in speaker_name.lower():
-            return speaker_name, representing
+    role_match = _SPECIAL_ROLE_RE.match(lowered)
+    if role_match:
+        return speaker_name, _SPECIAL_ROLES[role_match.lastindex - 1][1]
     
     # Pattern 9: If name contains "of" followed by organization/country
-    of_pattern = r'^(.+?)\s+of\s+(.+)$'
-    of_match = re.match(of_pattern, speaker_name, re.IGNORECASE)
-    if of_match:
-        name_part = of_match.group(1).strip()
-        org_part = of_match.group(2).strip()
+    of_split = _split_on_of(speaker_name, lowered)
+    if of_split:
+        name_part = of_split[0].strip()
+        org_part = of_split[1].strip()
         # Clean up common artifacts
         if org_part.startswith("the "):
             org_part = org_part[4:]
         return name_part, org_part
     
     # Pattern 10: Check if entire name is just an organization
-    if any(indicator.lower() in speaker_name.lower() for indicator in org_indicators):
+    if org_ranks:
         # If it's mostly uppercase or contains clear org indicators
-        if speaker_name.isupper() or any(word in speaker_name.lower() for word in ['ministry', 'department', 'office', 'un ']):
+        if speaker_name.isupper() or _ORG_ONLY_RE.search(lowered):
             return speaker_name, speaker_name
     
     # Pattern 11: Look for name patterns (First Last format) vs organization patterns
-    words = speaker_name.split()
-    if len(words) >= 2:
+    # (org hits come from the indicator scan; only the first two words are split off)
+    if not org_ranks:
+        words = speaker_name.split(None, 2)
         # Check if it looks like a person's name (First Last pattern)
-        if (words[0][0].isupper() and words[1][0].isupper() and 
-            len(words[0]) > 1 and len(words[1]) > 1 and
-            not any(indicator.lower() in speaker_name.lower() for indicator in org_indicators)):
+        if (len(words) >= 2 and
+            words[0][0].isupper() and words[1][0].isupper() and 
+            len(words[0]) > 1 and len(words[1]) > 1):
             # Looks like a person's name without clear organization
             return speaker_name, "Not specified"
     
     # Clean up the speaker name (remove excessive descriptive text)
     clean_name = speaker_name
-    if " - " in clean_name and len(clean_name.split(" - ")) == 2:
-        parts = clean_name.split(" - ")
+    parts = clean_name.split(" - ")
+    if len(parts) == 2:
         if len(parts[0]) < len(parts[1]):  # Shorter part is likely the name
             clean_name = parts[0].strip()
         else:
             clean_name = parts[1].strip()
     elif " (" in clean_name:
-        clean_name = clean_name.split(" (")[0].strip()
+        clean_name = clean_name.partition(" (")[0].strip()
     
     # Default case: No clear organization pattern found
     return clean_name, "Not specified"
 
+def safe_time_convert(time_value, default=0.0):
+    """Convert a segment time (seconds or HH:MM:SS.mmm string) to float seconds."""
+    # Fast path: JSON numbers need no parsing or exception handling
+    value_type = type(time_value)
+    if value_type is float:
+        return time_value
+    if value_type is int:
+        return float(time_value)
+    
+    try:
+        # If it's a string in HH:MM:SS.mmm format, convert to seconds
+        # (any other number of fields fails to unpack or parse -> default)
+        if isinstance(time_value, str) and ':' in time_value:
+            hours, minutes, seconds = map(float, time_value.split(':', 2))
+            return hours * 3600 + minutes * 60 + seconds
+        
+        if time_value is None:
+            return default
+        
+        # Try to convert as is
+        return float(time_value)
+        
+    except (ValueError, TypeError):
+        return default
+
+_speaker_of_segment = methodcaller('get', 'speaker', 'Unknown')
+
+def _iter_speaker_runs(transcript_data):
+    """Yield (speaker, combined_text, start_time, end_time, segment_count) per speaker turn."""
+    # Each run of consecutive segments with the same speaker becomes one turn
+    for speaker, run in groupby(transcript_data, key=_speaker_of_segment):
+        run = list(run)
+        
+        # End time comes from the last segment in the turn that carries one
+        end_raw = 0
+        for segment in reversed(run):
+            if 'end' in segment:
+                end_raw = segment['end']
+                break
+        
+        yield (
+            speaker,
+            ' '.join([segment.get('text', '') for segment in run]),
+            safe_time_convert(run[0].get('start', 0)),
+            safe_time_convert(end_raw),
+            len(run)
+        )
+
 def group_consecutive_segments(transcript_data):
     """Group consecutive segments from the same speaker into single entries - exact logic from organize_speakers_table.py"""
     if not transcript_data:
         return []
     
-    # Helper function to safely convert time to float
-    def safe_time_convert(time_value, default=0.0):
-        try:
-            if time_value is None:
-                return default
-            
-            # If it's already a number, return it
-            if isinstance(time_value, (int, float)):
-                return float(time_value)
-            
-            # If it's a string in HH:MM:SS.mmm format, convert to seconds
-            if isinstance(time_value, str) and ':' in time_value:
-                time_parts = time_value.split(':')
-                if len(time_parts) == 3:
-                    hours = float(time_parts[0])
-                    minutes = float(time_parts[1])
-                    seconds = float(time_parts[2])
-                    return hours * 3600 + minutes * 60 + seconds
-            
-            # Try to convert as is
-            return float(time_value)
-            
-        except (ValueError, TypeError):
-            return default
-    
-    grouped_segments = []
-    current_group = {
-        'speaker': transcript_data[0].get('speaker', 'Unknown'),
-        'text_parts': [transcript_data[0].get('text', '')],
-        'start_time': safe_time_convert(transcript_data[0].get('start', 0)),
-        'end_time': safe_time_convert(transcript_data[0].get('end', 0)),
-        'segment_count': 1
-    }
-    
-    for i in range(1, len(transcript_data)):
-        segment = transcript_data[i]
-        current_speaker = segment.get('speaker', 'Unknown')
-        previous_speaker = current_group['speaker']
-        
-        # If same speaker, add to current group
-        if current_speaker == previous_speaker:
-            current_group['text_parts'].append(segment.get('text', ''))
-            current_group['end_time'] = safe_time_convert(segment.get('end', current_group['end_time']))
-            current_group['segment_count'] += 1
-        else:
-            # Different speaker, save current group and start new one
-            current_group['combined_text'] = ' '.join(current_group['text_parts'])
-            grouped_segments.append(current_group.copy())
-            
-            # Start new group
-            current_group = {
-                'speaker': current_speaker,
-                'text_parts': [segment.get('text', '')],
-                'start_time': safe_time_convert(segment.get('start', 0)),
-                'end_time': safe_time_convert(segment.get('end', 0)),
-                'segment_count': 1
-            }
-    
-    # Don't forget the last group
-    current_group['combined_text'] = ' '.join(current_group['text_parts'])
-    grouped_segments.append(current_group)
-    
-    return grouped_segments
+    return [
+        {
+            'speaker': speaker,
+            'combined_text': combined_text,
+            'start_time': start_time,
+            'end_time': end_time,
+            'segment_count': segment_count
+        }
+        for speaker, combined_text, start_time, end_time, segment_count in _iter_speaker_runs(transcript_data)
+    ]
+
+def iter_speaker_rows(transcript_data):
+    """
+    Group speaker turns and parse speaker names in a single pass, yielding
+    table rows directly (used when no speaker profiles are available).
+    """
+    _parse = parse_speaker_info
+    for speaker, combined_text, start_time, end_time, segment_count in _iter_speaker_runs(transcript_data):
+        clean_speaker, representing = _parse(speaker)
+        yield {
+            'speaker': clean_speaker,
+            'representing': representing,
+            'content': combined_text,
+            'start_time': start_time,
+            'end_time': end_time,
+            'duration_seconds': end_time - start_time,
+            'segment_count': segment_count
+        }
 
 def parse_speakers_list_file(file_path):
     """
     Parse speakers_list.txt file to extract structured speaker profiles.
     Returns list of speaker profile dictionaries.
     """
-    from pathlib import Path
-    
     file_path = Path(file_path)
     if not file_path.exists():
         return []
@@ -3023,26 +4086,12 @@ If uncertain, return:
         if VERBOSE:
             print(f"  ← Response: {result_text[:150]}...")
         
-        # Clean JSON
-        if "```json" in result_text:
-            result_text = result_text.split("```json")[1].split("```")[0]
-        elif "```" in result_text:
-            result_text = result_text.split("```")[1].split("```")[0]
-        
-        result_text = result_text.strip()
-        
-        if not result_text.startswith('{'):
-            start = result_text.find('{')
-            if start != -1:
-                result_text = result_text[start:]
-        if not result_text.endswith('}'):
-            end = result_text.rfind('}')
-            if end != -1:
-                result_text = result_text[:end+1]
+        # Clean JSON: the object itself, past any ```json fence or extra text
+        result_text = extract_json_object_text(result_text)
         
         # Parse JSON
         try:
-            result = json.loads(result_text)
+            result = loads_json(result_text)
             name = result.get('name')
             representing = result.get('representing')
             
@@ -3167,27 +4216,12 @@ If uncertain, return: {{"name": null, "representing": null}}"""
         response = client.chat.completions.create(**api_params)
         result_text = response.choices[0].message.content.strip()
         
-        # Clean JSON - more aggressive
-        if "```json" in result_text:
-            result_text = result_text.split("```json")[1].split("```")[0]
-        elif "```" in result_text:
-            result_text = result_text.split("```")[1].split("```")[0]
-        
-        result_text = result_text.strip()
-        
-        # Extract JSON object boundaries
-        if not result_text.startswith('{'):
-            start = result_text.find('{')
-            if start != -1:
-                result_text = result_text[start:]
-        if not result_text.endswith('}'):
-            end = result_text.rfind('}')
-            if end != -1:
-                result_text = result_text[:end+1]
+        # Clean JSON: the object itself, past any ```json fence or extra text
+        result_text = extract_json_object_text(result_text)
         
         # Try standard JSON parsing
         try:
-            result = json.loads(result_text)
+            result = loads_json(result_text)
             name = result.get('name')
             representing = result.get('representing')
             return name, representing
@@ -3225,35 +4259,117 @@ If uncertain, return: {{"name": null, "representing": null}}"""
             print(f"  ⚠ Context identification error: {e}")
         return None, None
 
+def merge_speech_continuation(prev_row, current_row, turn_number):
+    """
+    Post-processing check for a remaining "Participant X" label: if the turn looks
+    like a continuation of the previous (non-generic) speaker, relabel it in place.
+    Returns True when the row was merged.
+    """
+    # Check if current speaker is still a generic label
+    if not is_generic_speaker_label(current_row['speaker']):
+        return False
+    
+    prev_speaker = prev_row['speaker']
+    current_text = current_row['content']
+    prev_text = prev_row['content']
+    
+    # Check if this looks like a continuation (no speaker change indicators)
+    is_continuation = False
+    
+    # Get first 200 chars of current text
+    current_start = current_text[:200].lower()
+    
+    # Patterns that indicate a NEW speaker (NOT a continuation)
+    new_speaker_patterns = [
+        'thank you',
+        'i give the floor',
+        'next speaker',
+        'moving on',
+        'my name is',
+        'i am from',
+        'representing',
+        'on behalf of'
+    ]
+    
+    # Check if current text starts with a new speaker indicator
+    has_new_speaker_indicator = any(pattern in current_start[:50] for pattern in new_speaker_patterns)
+    
+    # If no new speaker indicator AND previous speaker is not generic
+    # then this is likely a continuation
+    if not has_new_speaker_indicator and not is_generic_speaker_label(prev_speaker):
+        # Additional check: time gap (if small gap, more likely continuation)
+        time_gap = current_row['start_time'] - prev_row['end_time']
+        
+        # If gap is less than 5 seconds, very likely a continuation
+        if time_gap < 5.0:
+            is_continuation = True
+            log.debug("  🔗 Turn %d: '%s' → Continuation of '%s' (gap: %.1fs)", turn_number, current_row['speaker'], prev_speaker, time_gap)
+        # If gap is 5-15 seconds, check content similarity
+        elif time_gap < 15.0:
+            # Check if content flows naturally (no abrupt topic change)
+            # Simple heuristic: if current doesn't start with capital letter after period, likely continuation
+            prev_end = prev_text.strip()[-100:].lower()
+            
+            # If previous ends mid-sentence or current continues thought
+            current_first_char = current_text.strip()[0] if current_text.strip() else ''
+            if not prev_end.endswith('.') or (current_first_char.isalpha() and current_first_char.islower()):
+                is_continuation = True
+                log.debug("  🔗 Turn %d: '%s' → Continuation of '%s' (content flows)", turn_number, current_row['speaker'], prev_speaker)
+    
+    if is_continuation:
+        # Merge with previous speaker
+        current_row['speaker'] = prev_speaker
+        current_row['representing'] = prev_row['representing']
+        log.info("  ✓ Merged: Turn %d '%s'", turn_number, current_row['speaker'])
+    
+    return is_continuation
+
 def create_speakers_table(transcript_data, meeting_id, speakers_list_path=None):
     """
     Create a structured table from the transcript data matching the database schema.
     Now enhanced with speaker profile matching from speakers_list.txt for accurate representation.
     """
-    print(f"Processing {len(transcript_data)} transcript segments...")
+    # Nothing to organize (e.g. a meeting with no detected speech)
+    if not transcript_data:
+        return []
+    
+    log.info("Processing %d transcript segments...", len(transcript_data))
     
     # Parse speaker profiles if provided
     speaker_profiles = []
     if speakers_list_path:
         speaker_profiles = parse_speakers_list_file(speakers_list_path)
         if speaker_profiles:
-            print(f"Loaded {len(speaker_profiles)} speaker profiles from speakers_list.txt")
+            log.info("Loaded %d speaker profiles from speakers_list.txt", len(speaker_profiles))
         else:
-            print("No speaker profiles found in speakers_list.txt, falling back to text parsing")
-    
-    # Group consecutive segments from same speaker
-    grouped_segments = group_consecutive_segments(transcript_data)
-    print(f"Grouped into {len(grouped_segments)} speaker turns...")
+            log.info("No speaker profiles found in speakers_list.txt, falling back to text parsing")
     
     # Create table data
     table_data = []
     match_stats = {'matched': 0, 'unmatched': 0, 'fallback': 0, 'context_identified': 0}
     
-    for i, group in enumerate(grouped_segments):
-        speaker_name = group['speaker']
+    # Continuations of the previous speaker are merged as each row is built,
+    # so the table is only traversed once
+    merge_count = 0
+    
+    if not speaker_profiles:
+        # Fallback to old parsing method if no profiles available:
+        # grouping and parsing are fused, so no intermediate turn list is built
+        for row in iter_speaker_rows(transcript_data):
+            if table_data and merge_speech_continuation(table_data[-1], row, len(table_data) + 1):
+                merge_count += 1
+            table_data.append(row)
+        log.info("Grouped into %d speaker turns...", len(table_data))
+        match_stats['fallback'] = len(table_data)
+    else:
+        # Group consecutive segments from same speaker (neighbouring turns are needed for context)
+        grouped_segments = group_consecutive_segments(transcript_data)
+        log.info("Grouped into %d speaker turns...", len(grouped_segments))
         
-        # Try to match with speaker profiles
-        if speaker_profiles:
+        for i, group in enumerate(grouped_segments):
+            speaker_name = group['speaker']
+            
+            # Try to match with speaker profiles
             matched_profile = match_speaker_to_profile(speaker_name, speaker_profiles)
             
             if matched_profile:
@@ -3265,9 +4381,8 @@ def create_speakers_table(transcript_data, meeting_id, speakers_list_path=None):
                 # No match - check if it's a generic label
                 if is_generic_speaker_label(speaker_name):
                     # Try context-based identification
-                    if VERBOSE:
-                        print(f"\n🎯 Turn {i+1}/{len(grouped_segments)}: Generic label '{speaker_name}' detected")
-                        print(f"   Attempting context-based identification...")
+                    log.debug("\n🎯 Turn %d/%d: Generic label '%s' detected", i + 1, len(grouped_segments), speaker_name)
+                    log.debug("   Attempting context-based identification...")
                     
                     context_text, has_prev, has_next = extract_speaker_transition_context(
                         grouped_segments, i, lines_per_speaker=4
@@ -3282,11 +4397,11 @@ def create_speakers_table(transcript_data, meeting_id, speakers_list_path=None):
                         clean_speaker = identified_name
                         representing = identified_org if identified_org else "Not specified"
                         match_stats['context_identified'] += 1
-                        print(f"  ✓ Context ID: '{speaker_name}' → '{clean_speaker}'")
+                        log.info("  ✓ Context ID: '%s' → '%s'", speaker_name, clean_speaker)
                     else:
                         # FALLBACK: Try direct chunk-based identification with GPT-4
                         # Use full grouped speaker turns for better context
-                        print(f"   First attempt failed, trying chunk-based fallback...")
+                        log.info("   First attempt failed, trying chunk-based fallback...")
                         
                         # Get previous, current, and next grouped segments
                         prev_group = grouped_segments[i - 1] if i > 0 else None
@@ -3301,10 +4416,10 @@ def create_speakers_table(transcript_data, meeting_id, speakers_list_path=None):
                             clean_speaker = chunk_name
                             representing = chunk_org if chunk_org else "Not specified"
                             match_stats['context_identified'] += 1
-                            print(f"  ✓ Chunk Fallback: '{speaker_name}' → '{clean_speaker}'")
+                            log.info("  ✓ Chunk Fallback: '%s' → '%s'", speaker_name, clean_speaker)
                         else:
                             # Still unknown after all attempts
-                            print(f"  ✗ Chunk fallback failed - keeping generic label")
+                            log.info("  ✗ Chunk fallback failed - keeping generic label")
                             clean_speaker = speaker_name
                             representing = "Not specified"
                             match_stats['unmatched'] += 1
@@ -3313,103 +4428,37 @@ def create_speakers_table(transcript_data, meeting_id, speakers_list_path=None):
                     clean_speaker = speaker_name
                     representing = "Not specified"
                     match_stats['unmatched'] += 1
-        else:
-            # Fallback to old parsing method if no profiles available
-            clean_speaker, representing = parse_speaker_info(speaker_name)
-            match_stats['fallback'] += 1
-        
-        # Create row matching the database schema
-        row = {
-            'speaker': clean_speaker,
-            'representing': representing,
-            'content': group['combined_text'],
-            'start_time': group['start_time'],
-            'end_time': group['end_time'],
-            'duration_seconds': group['end_time'] - group['start_time'],
-            'segment_count': group['segment_count']  # Extra info: how many segments were combined
-        }
-        
-        table_data.append(row)
-    
-    # POST-PROCESSING: Check if remaining "Participant X" labels are continuations
-    print("\n🔍 Post-processing: Checking for speech continuations...")
-    merge_count = 0
-    
-    for i in range(1, len(table_data)):
-        current_row = table_data[i]
-        prev_row = table_data[i - 1]
-        
-        # Check if current speaker is still a generic label
-        if is_generic_speaker_label(current_row['speaker']):
-            prev_speaker = prev_row['speaker']
-            current_text = current_row['content']
-            prev_text = prev_row['content']
-            
-            # Check if this looks like a continuation (no speaker change indicators)
-            is_continuation = False
-            
-            # Get first 200 chars of current text
-            current_start = current_text[:200].lower()
-            
-            # Patterns that indicate a NEW speaker (NOT a continuation)
-            new_speaker_patterns = [
-                'thank you',
-                'i give the floor',
-                'next speaker',
-                'moving on',
-                'my name is',
-                'i am from',
-                'representing',
-                'on behalf of'
-            ]
-            
-            # Check if current text starts with a new speaker indicator
-            has_new_speaker_indicator = any(pattern in current_start[:50] for pattern in new_speaker_patterns)
             
-            # If no new speaker indicator AND previous speaker is not generic
-            # then this is likely a continuation
-            if not has_new_speaker_indicator and not is_generic_speaker_label(prev_speaker):
-                # Additional check: time gap (if small gap, more likely continuation)
-                time_gap = current_row['start_time'] - prev_row['end_time']
-                
-                # If gap is less than 5 seconds, very likely a continuation
-                if time_gap < 5.0:
-                    is_continuation = True
-                    if VERBOSE:
-                        print(f"  🔗 Turn {i+1}: '{current_row['speaker']}' → Continuation of '{prev_speaker}' (gap: {time_gap:.1f}s)")
-                # If gap is 5-15 seconds, check content similarity
-                elif time_gap < 15.0:
-                    # Check if content flows naturally (no abrupt topic change)
-                    # Simple heuristic: if current doesn't start with capital letter after period, likely continuation
-                    prev_end = prev_text.strip()[-100:].lower()
-                    
-                    # If previous ends mid-sentence or current continues thought
-                    current_first_char = current_text.strip()[0] if current_text.strip() else ''
-                    if not prev_end.endswith('.') or (current_first_char.isalpha() and current_first_char.islower()):
-                        is_continuation = True
-                        if VERBOSE:
-                            print(f"  🔗 Turn {i+1}: '{current_row['speaker']}' → Continuation of '{prev_speaker}' (content flows)")
+            # Create row matching the database schema
+            row = {
+                'speaker': clean_speaker,
+                'representing': representing,
+                'content': group['combined_text'],
+                'start_time': group['start_time'],
+                'end_time': group['end_time'],
+                'duration_seconds': group['end_time'] - group['start_time'],
+                'segment_count': group['segment_count']  # Extra info: how many segments were combined
+            }
             
-            if is_continuation:
-                # Merge with previous speaker
-                current_row['speaker'] = prev_speaker
-                current_row['representing'] = prev_row['representing']
+            if table_data and merge_speech_continuation(table_data[-1], row, i + 1):
                 merge_count += 1
-                print(f"  ✓ Merged: Turn {i+1} '{table_data[i]['speaker']}'")
+            table_data.append(row)
     
     if merge_count > 0:
-        print(f"✓ Merged {merge_count} continuation segments")
+        log.info("✓ Merged %d continuation segments", merge_count)
     else:
-        print(f"✓ No continuations found")
+        log.info("✓ No continuations found")
     
     # Print matching statistics
     if speaker_profiles:
         total = len(grouped_segments)
         context_id = match_stats.get('context_identified', 0)
         if context_id > 0:
-            print(f"Speaker matching: {match_stats['matched']} matched, {context_id} context-identified, {match_stats['unmatched']} unmatched (out of {total} speaker turns)")
+            log.info("Speaker matching: %d matched, %d context-identified, %d unmatched (out of %d speaker turns)",
+                     match_stats['matched'], context_id, match_stats['unmatched'], total)
         else:
-            print(f"Speaker matching: {match_stats['matched']} matched, {match_stats['unmatched']} unmatched (out of {total} speaker turns)")
+            log.info("Speaker matching: %d matched, %d unmatched (out of %d speaker turns)",
+                     match_stats['matched'], match_stats['unmatched'], total)
     
     return table_data
 
@@ -3452,8 +4501,6 @@ def copy_transcript_files(source_dir: Path, target_dir: Path) -> Tuple[Path, Pat
     Copy only transcript files (txt and srt) from an existing meeting.
     Returns: (transcript_path, srt_path)
     """
-    import shutil
-    
     # Silent operation - logging handled by caller
     target_dir.mkdir(parents=True, exist_ok=True)
     
@@ -3511,10 +4558,17 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
         'errors': []
     }
     
+    # Intermediate transcript.json (and its background writer), removed on exit
+    json_path = None
+    srt_future = None
+    
     try:
         # ========== CHECK FOR EXISTING TRANSCRIPT ==========
         logger.step("Checking for existing transcripts")
-        uploads_dir = target_dir.parent  # Get uploads directory
+        uploads_dir = target_dir.parent  # Get uploads directory (result paths are relative to it)
+        # Every result file lives directly in target_dir, so its path relative to
+        # uploads_dir is this prefix plus the file name
+        result_prefix = target_dir.name + os.sep
         existing_meeting, existing_dir = check_for_existing_transcript(url, uploads_dir)
         
         if existing_meeting:
@@ -3527,19 +4581,18 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
             
             # Also copy audio file if it exists (silent operation)
             try:
-                import shutil
                 source_audio = existing_dir / 'audio.mp3'
                 target_audio = target_dir / 'audio.mp3'
                 if source_audio.exists():
                     shutil.copy2(source_audio, target_audio)
-                    results['audio'] = str(target_audio.relative_to(target_dir.parent))
+                    results['audio'] = result_prefix + target_audio.name
                     logger.debug("Copied audio.mp3")
             except Exception as e:
                 logger.warning(f"Could not copy audio file: {e}")
             
             # Set paths for copied files
-            results['transcript'] = str(transcript_path.relative_to(target_dir.parent))
-            results['srt'] = str(srt_path.relative_to(target_dir.parent))
+            results['transcript'] = result_prefix + transcript_path.name
+            results['srt'] = result_prefix + srt_path.name
             
             # Set metadata indicating this was reused
             results['metadata'] = {
@@ -3559,14 +4612,16 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
             audio_path, metadata = download_audio(url, str(target_dir))
             file_size_mb = metadata.get('file_size', 0) / (1024 * 1024)
             logger.step_complete(f"{file_size_mb:.1f} MB")
-            results['audio'] = str(audio_path.relative_to(target_dir.parent))
+            results['audio'] = result_prefix + audio_path.name
             results['metadata'] = metadata
             
             # Step 2: Transcribe audio with GPU support
-            device_name = "GPU" if TORCH_AVAILABLE and torch.cuda.is_available() else "CPU"
+            device_name = "GPU" if cuda_available() else "CPU"
             logger.step(f"Transcribing audio ({device_name})")
             trans_start = time.time()
-            transcript_path, srt_path = transcribe_audio(audio_path, str(target_dir))
+            transcript_path, srt_path, audio_duration = transcribe_audio(audio_path, str(target_dir))
+            if not metadata.get('duration'):
+                metadata['duration'] = audio_duration
             trans_duration = time.time() - trans_start
             trans_minutes = int(trans_duration // 60)
             trans_seconds = int(trans_duration % 60)
@@ -3576,25 +4631,37 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
                 segment_count = len([l for l in f.read().split('\n\n') if l.strip()])
             
             logger.step_complete(f"{segment_count} segments, {trans_minutes}m {trans_seconds}s")
-            results['transcript'] = str(transcript_path.relative_to(target_dir.parent))
-            results['srt'] = str(srt_path.relative_to(target_dir.parent))
+            results['transcript'] = result_prefix + transcript_path.name
+            results['srt'] = result_prefix + srt_path.name
         
         # ========== COMMON PATH: Speaker Processing & Summaries ==========
         # Step 3-4: Extract speakers
         logger.step("Extracting speakers")
-        ai_model = "GPT-4" if get_azure_openai_config() else "Gemini"
+        azure_config = get_azure_openai_config()  # Looked up once for Steps 3-5
+        ai_model = "GPT-4" if azure_config else "Gemini"
         logger.step_detail(f"Using {ai_model}")
         
+        # SRT -> JSON conversion is only needed in Step 5, so it runs on a
+        # worker thread while speaker extraction waits on the AI provider
         json_path = target_dir / 'transcript.json'
-        transcript_json = srt_to_json(srt_path, json_path)
+        srt_executor = ThreadPoolExecutor(max_workers=1)
+        srt_future = srt_executor.submit(srt_to_json, srt_path, json_path)
+        srt_executor.shutdown(wait=False)  # the submitted conversion still runs to completion
         
-        with open(transcript_path, 'r', encoding='utf-8') as f:
-            transcript_text = f.read()
+        # One binary read plus decode. Line endings are normalised like text mode
+        # would, but only when there is a '\r' (transcripts written on Windows,
+        # or reused from older runs)
+        transcript_text = Path(transcript_path).read_bytes().decode('utf-8')
+        if '\r' in transcript_text:
+            transcript_text = transcript_text.replace('\r\n', '\n').replace('\r', '\n')
         
         # Extract speaker information (silently unless verbose)
         speaker_info = None
         total_pipeline_tokens = 0
-        if get_azure_openai_config():
+        if not transcript_text.strip():
+            # Nothing was said, so there is nobody to extract
+            speaker_info = {"speakers": []}
+        elif azure_config:
             speaker_info, extraction_tokens = extract_speaker_info_with_gpt(transcript_text)
             total_pipeline_tokens += extraction_tokens
         if speaker_info is None:
@@ -3603,6 +4670,8 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
         num_speakers = len(speaker_info.get('speakers', [])) if speaker_info else 0
         logger.step_complete(f"{num_speakers} speakers identified")
         
+        transcript_json = srt_future.result()
+        
         # Save speaker profiles to text file
         speakers_list_path = None  # Initialize for later use
         if speaker_info and speaker_info.get('speakers'):
@@ -3644,25 +4713,17 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
         
         filled_transcript = None
         diarization_tokens = 0
-        if get_azure_openai_config():
+        if azure_config:
             filled_transcript, diarization_tokens = fill_speakers_with_gpt_enhanced(transcript_json, global_speaker_context, speaker_info)
             total_pipeline_tokens += diarization_tokens
         if filled_transcript is None:
             filled_transcript = fill_speakers_in_json(transcript_json, global_speaker_context)
         
-        # Save filled transcript (silent)
-        filled_json_path = target_dir / 'transcript_speaker_filled.json'
-        with open(filled_json_path, 'w', encoding='utf-8') as f:
-            json.dump(filled_transcript, f, indent=2, ensure_ascii=False)
-        
         # ✨ NEW: Pre-label generic speakers from context BEFORE creating structured segments
         # This improves speaker matching by replacing generic labels like "Participant 1"
         # with actual names extracted from moderator introductions
         if filled_transcript:
             filled_transcript = relabel_generic_speakers_from_context(filled_transcript)
-            # Re-save the improved transcript
-            with open(filled_json_path, 'w', encoding='utf-8') as f:
-                json.dump(filled_transcript, f, indent=2, ensure_ascii=False)
             
             # ✨ Extract new speakers found via relabeling and create pseudo-profiles
             # This ensures we have profiles for countries identified from context
@@ -3705,8 +4766,11 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
                         
                         f.write("=" * 80 + "\n")
                     
-                    if VERBOSE:
-                        print(f"✓ Updated speaker profiles: {num_speakers} total speakers ({len(new_speakers_found)} from relabeling)")
+                    log.debug("✓ Updated speaker profiles: %d total speakers (%d from relabeling)", num_speakers, len(new_speakers_found))
+        
+        # The filled transcript stays in memory; only dump it when debugging
+        if WRITE_INTERMEDIATES:
+            write_json_file(filled_transcript, target_dir / 'transcript_speaker_filled.json')
         
         # Step 6-7: Create structured segments
         structured_segments = create_speakers_table(filled_transcript, 1, speakers_list_path)
@@ -3715,49 +4779,37 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
         # Create speaker transcript file
         logger.step("Generating transcript")
         speakers_path = target_dir / 'transcript_speakers.txt'
+        
+        # Build the whole document in memory and write it in one call
+        lines = [f"# Speaker-separated transcript for: {title}\n\n"]
+        for segment in structured_segments:
+            representing = segment['representing']
+            start_time = segment['start_time']
+            end_time = segment['end_time']
+            
+            # Optional header parts are empty strings, so every segment goes
+            # through the same single f-string below
+            org_info = f", {representing}" if representing and representing != "Not specified" else ""
+            if start_time is not None and end_time is not None:
+                # Format timing as MM:SS for readability
+                start_min, start_sec = divmod(int(start_time), 60)
+                end_min, end_sec = divmod(int(end_time), 60)
+                timing_info = f" ({start_min:02d}:{start_sec:02d} - {end_min:02d}:{end_sec:02d})"
+            else:
+                timing_info = ""
+            
+            lines.append(f"[{segment['speaker']}{org_info}]{timing_info}\n{segment['content']}\n\n")
+        
         with open(speakers_path, 'w', encoding='utf-8') as f:
-            f.write(f"# Speaker-separated transcript for: {title}\n\n")
-            for segment in structured_segments:
-                speaker = segment['speaker']
-                representing = segment['representing']
-                content = segment['content']
-                start_time = segment['start_time']
-                end_time = segment['end_time']
-                
-                # Format speaker header
-                if representing and representing != "Not specified":
-                    speaker_header = f"[{speaker}, {representing}]"
-                else:
-                    speaker_header = f"[{speaker}]"
-                
-                # Add timing if available
-                if start_time is not None and end_time is not None:
-                    # Format timing as MM:SS for readability
-                    start_min = int(start_time // 60)
-                    start_sec = int(start_time % 60)
-                    end_min = int(end_time // 60)
-                    end_sec = int(end_time % 60)
-                    timing_info = f" ({start_min:02d}:{start_sec:02d} - {end_min:02d}:{end_sec:02d})"
-                    speaker_header += timing_info
-                
-                f.write(f"{speaker_header}\n")
-                f.write(f"{content}\n\n")
+            f.write(''.join(lines))
         
-        results['speakers'] = str(speakers_path.relative_to(target_dir.parent))
+        results['speakers'] = result_prefix + speakers_path.name
         results['segments'] = structured_segments
         logger.step_complete()
         
-        # Clean up intermediate files (silent)
-        logger.step("Cleaning up")
-        if json_path.exists():
-            json_path.unlink()
-        if filled_json_path.exists():
-            filled_json_path.unlink()
-        logger.step_complete()
-        
         # Show completion with timing
         if total_pipeline_tokens > 0:
-            print(f"\n🎯 Total pipeline tokens used: {total_pipeline_tokens:,}")
+            log_token_count("\n🎯 Total pipeline tokens used: %s", total_pipeline_tokens)
         logger.complete()
         
     except Exception as e:
@@ -3765,5 +4817,11 @@ def run_full_pipeline(url: str, title: str, target_dir: str) -> Dict:
         results['errors'].append(error_msg)
         logger.error(f"Pipeline failed: {error_msg}")
         raise
+    finally:
+        # Clean up intermediate files (silent), also when a step failed
+        if json_path is not None and not WRITE_INTERMEDIATES:
+            if srt_future is not None:
+                wait([srt_future])  # the background conversion may still be writing it
+            json_path.unlink(missing_ok=True)
     
     return results 
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Diarization batch prompt and tabular (index|speaker) reply round trip
+"""
+from app.pipeline import build_batch_prompt, decompress_batch_response
+
+
+def make_batch():
+    return [
+        {'index': 360, 'text': 'principles.'},
+        {'index': 361, 'text': 'Two | bolster\nthe network'},
+    ]
+
+
+def test_build_batch_prompt_lists_segments_as_rows():
+    prompt = build_batch_prompt(make_batch(), 1, 3, "SPK:1|Chair|ITU|\n", "")
+
+    assert 'Format: seg[N]{i,t}:' in prompt
+    assert 'Return: spk[N]{i,s}:' in prompt
+    assert 'seg[2]{i,t}:\n360|principles.\n361|Two \\| bolster\\nthe network' in prompt
+
+
+def test_tabular_reply_round_trip():
+    batch = make_batch()
+    prompt = build_batch_prompt(batch, 1, 1, "", "")
+    rows = prompt.split('seg[2]{i,t}:\n', 1)[1].split('\n\nRules:', 1)[0].splitlines()
+    indices = [row.split('|', 1)[0] for row in rows]
+    speakers = ['Chair', 'Mr. A \\| ITU']
+    reply = "```\nspk[2]{i,s}:\n" + "\n".join(f"{i} | {s}" for i, s in zip(indices, speakers)) + "\n```"
+
+    filled = decompress_batch_response(reply, batch)
+
+    assert [seg['speaker'] for seg in filled] == ['Chair', 'Mr. A | ITU']
+    assert [seg['index'] for seg in filled] == [360, 361]
+
+
+def test_json_reply_still_accepted():
+    filled = decompress_batch_response('[[360,"Chair"],[361,"Mr. A"]]', make_batch())
+
+    assert [seg['speaker'] for seg in filled] == ['Chair', 'Mr. A']